@@ -7,9 +7,9 @@
 import asyncio
 import signal
 import sys
-import traceback
-from typing import Optional
 import time
+from decimal import Decimal
+from typing import Dict, Optional, Tuple
 
 from edgex_sdk import Client
 from .config import GridTradingConfig
@@ -17,6 +17,148 @@ from .logger import GridTradingLogger
 from .grid_strategy import GridTradingStrategy
 
 
+# 共享的EdgeX客户端缓存，按 (base_url, account_id) 复用连接池
+_client_cache: Dict[Tuple[str, int], Client] = {}
+
+# 账户资产缓存，按 account_id 保存 (获取时间, 资产数据)
+_asset_cache: Dict[int, Tuple[float, dict]] = {}
+
+# run_event_loop 共用的事件循环
+_event_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+async def get_shared_client(config: GridTradingConfig) -> Client:
+    """
+    获取共享的EdgeX客户端
+    
+    同一账户的机器人和余额查询共用一个客户端，避免重复建立TCP/TLS连接
+    
+    Args:
+        config: 配置对象
+        
+    Returns:
+        Client: EdgeX客户端
+    """
+    key = (config.edgex_base_url, int(config.edgex_account_id))
+    client = _client_cache.get(key)
+    if client is None:
+        client = Client(
+            base_url=config.edgex_base_url,
+            account_id=int(config.edgex_account_id),
+            stark_private_key=config.edgex_stark_private_key
+        )
+        _client_cache[key] = client
+    return client
+
+
+async def _get_account_asset(client: Client, config: GridTradingConfig) -> dict:
+    """
+    获取账户资产数据，在 balance_cache_ttl 内复用上一次的结果
+    
+    Args:
+        client: EdgeX客户端
+        config: 配置对象
+        
+    Returns:
+        dict: 账户资产数据（接口返回的 data 字段）
+    """
+    account_id = int(config.edgex_account_id)
+    cached = _asset_cache.get(account_id)
+    if cached and time.monotonic() - cached[0] < config.balance_cache_ttl:
+        return cached[1]
+    
+    assets_data = await client.get_account_asset()
+    
+    if not assets_data or 'data' not in assets_data:
+        raise ValueError("无法获取账户资产信息")
+    
+    data = assets_data['data']
+    _asset_cache[account_id] = (time.monotonic(), data)
+    return data
+
+
+def _parse_assets(data: dict) -> dict:
+    """
+    将账户资产数据解析为余额信息
+    
+    Args:
+        data: 账户资产数据（接口返回的 data 字段）
+        
+    Returns:
+        dict: 余额信息
+    """
+    balance_info = {
+        'total_balance': '0',
+        'available_balance': '0',
+        'frozen_balance': '0',
+        'unrealized_pnl': '0',
+        'positions': []
+    }
+    
+    # 获取抵押品信息
+    collateral_list = data.get('collateralList', [])
+    if collateral_list:
+        collateral = collateral_list[0]  # 通常只有一个抵押品（USDC）
+        balance_info['total_balance'] = collateral.get('totalSize', '0')
+        balance_info['available_balance'] = collateral.get('availableSize', '0')
+        balance_info['frozen_balance'] = collateral.get('frozenSize', '0')
+    
+    # 获取持仓信息，单次遍历同时累计总未实现盈亏
+    position_list = data.get('positionList', [])
+    positions = balance_info['positions']
+    total_unrealized_pnl = Decimal('0')
+    for position in position_list:
+        get = position.get
+        open_size = get('openSize', '0')
+        if open_size != '0':  # 只显示有持仓的合约
+            unrealized_pnl = get('unrealizedPnl', '0')
+            total_unrealized_pnl += Decimal(unrealized_pnl)
+            positions.append({
+                'contract_id': get('contractId', ''),
+                'contract_name': get('contractName', ''),
+                'open_size': open_size,
+                'unrealized_pnl': unrealized_pnl,
+                'margin': get('margin', '0')
+            })
+    
+    balance_info['unrealized_pnl'] = str(total_unrealized_pnl)
+    
+    return balance_info
+
+
+def invalidate_balance_cache(account_id: Optional[str] = None):
+    """
+    使账户资产缓存失效
+    
+    Args:
+        account_id: 账户ID，为None时清空所有缓存
+    """
+    if account_id is None:
+        _asset_cache.clear()
+    else:
+        _asset_cache.pop(int(account_id), None)
+
+
+async def close_shared_client(config: GridTradingConfig):
+    """
+    关闭指定账户的共享EdgeX客户端，其他账户的客户端不受影响
+    
+    Args:
+        config: 配置对象
+    """
+    client = _client_cache.pop((config.edgex_base_url, int(config.edgex_account_id)), None)
+    if client is not None:
+        await client.close()
+
+
+async def close_shared_clients():
+    """关闭所有共享的EdgeX客户端（进程退出前调用）"""
+    clients = list(_client_cache.values())
+    _client_cache.clear()
+    for client in clients:
+        await client.close()
+
+
 class GridTradingBot:
     """网格交易机器人主类"""
     
@@ -28,9 +170,13 @@ class GridTradingBot:
             config_file: 配置文件路径
         """
         # 加载配置
+        self.config_file = config_file
         self.config = GridTradingConfig(config_file)
         self.config.validate()
         
+        # 用于日志输出的配置（去除私钥）
+        self._safe_config_repr = self._build_safe_config_repr(self.config)
+        
         # 初始化日志
         self.logger = GridTradingLogger(
             name="GridTradingBot",
@@ -50,34 +196,97 @@ class GridTradingBot:
         self.restart_count = 0
         self.max_restart_count = 5
         
-        # 设置信号处理
-        self._setup_signal_handlers()
+        # 停止/重载事件和信号处理器（需要在事件循环中创建，见 initialize）
+        self._stop_event: Optional[asyncio.Event] = None
+        self._reload_event: Optional[asyncio.Event] = None
     
     def _setup_signal_handlers(self):
-        """设置信号处理器"""
-        def signal_handler(signum, frame):
+        """设置信号处理器（需要在事件循环中调用）"""
+        loop = asyncio.get_running_loop()
+        
+        def handle_stop(signum):
             self.logger.info(f"接收到信号 {signum}，正在优雅关闭...")
             self.is_running = False
+            # 唤醒主循环，无需等待下一个检查间隔
+            self._stop_event.set()
+        
+        def handle_reload(signum):
+            self.logger.info(f"接收到信号 {signum}，将重新加载配置...")
+            self._reload_event.set()
+        
+        handlers = [(signal.SIGINT, handle_stop), (signal.SIGTERM, handle_stop)]
+        if hasattr(signal, 'SIGHUP'):  # Windows 没有 SIGHUP
+            handlers.append((signal.SIGHUP, handle_reload))
         
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
+        try:
+            # 信号直接在事件循环中分发
+            for signum, handler in handlers:
+                loop.add_signal_handler(signum, handler, signum)
+        except NotImplementedError:
+            # Windows 事件循环不支持 add_signal_handler，回退到 signal.signal
+            for signum, handler in handlers:
+                signal.signal(
+                    signum,
+                    lambda signum, frame, handler=handler: loop.call_soon_threadsafe(handler, signum)
+                )
+    
+    @staticmethod
+    def _build_safe_config_repr(config: GridTradingConfig) -> dict:
+        """构建用于日志输出的配置字典（去除私钥）"""
+        safe_config = config.to_dict()
+        safe_config.pop('edgex_stark_private_key', None)
+        return safe_config
+    
+    async def reload_config(self) -> bool:
+        """
+        重新加载配置，不重建EdgeX客户端
+        
+        Returns:
+            bool: 是否重新加载成功
+        """
+        try:
+            new_config = GridTradingConfig(self.config_file)
+            new_config.validate()
+            
+            # 账户和交易对变化需要重建客户端和策略，只能通过重启生效
+            for key in ('edgex_base_url', 'edgex_account_id', 'trading_pair'):
+                if getattr(new_config, key) != getattr(self.config, key):
+                    raise ValueError(f"{key} 变更需要重启机器人才能生效")
+            
+            if self.strategy:
+                await self.strategy.apply_config(new_config)
+            
+            self.config = new_config
+            self._safe_config_repr = self._build_safe_config_repr(new_config)
+            self.logger.info("配置已重新加载: %s", self._safe_config_repr)
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"重新加载配置失败，继续使用原配置: {e}")
+            return False
     
     async def initialize(self):
         """初始化机器人"""
         try:
             self.logger.info("正在初始化网格交易机器人...")
-            self.logger.info(f"配置信息: {self.config.to_dict()}")
+            
+            # 创建停止事件，重启时保留已有事件以免丢失停止信号
+            if self._stop_event is None:
+                self._stop_event = asyncio.Event()
+            if self._reload_event is None:
+                self._reload_event = asyncio.Event()
+            
+            # 设置信号处理
+            self._setup_signal_handlers()
+            self.logger.info("配置信息: %s", self._safe_config_repr)
             
             # 初始化EdgeX客户端
-            self.edgex_client = Client(
-                base_url=self.config.edgex_base_url,
-                account_id=int(self.config.edgex_account_id),
-                stark_private_key=self.config.edgex_stark_private_key
-            )
+            self.edgex_client = await get_shared_client(self.config)
             
-            # 测试连接
-            server_time = await self.edgex_client.get_server_time()
-            self.logger.info(f"EdgeX连接成功 - 服务器时间: {server_time}")
+            # 测试连接（可选，后续的首个请求同样会暴露连接问题）
+            if self.config.verify_connection_on_init:
+                server_time = await self.edgex_client.get_server_time()
+                self.logger.info(f"EdgeX连接成功 - 服务器时间: {server_time}")
             
             # 初始化策略
             self.strategy = GridTradingStrategy(
@@ -86,15 +295,21 @@ class GridTradingBot:
                 logger=self.logger
             )
             
+            # 订单成交后余额发生变化，使缓存失效
+            self.strategy.on_order_filled = self._on_order_filled
+            
             await self.strategy.initialize()
             
             self.logger.info("网格交易机器人初始化完成")
             
         except Exception as e:
-            self.logger.error(f"初始化失败: {e}")
-            self.logger.error(f"错误详情: {traceback.format_exc()}")
+            self.logger.error("初始化失败: %s", e, exc_info=True)
             raise
     
+    def _on_order_filled(self, order_info):
+        """订单成交回调"""
+        invalidate_balance_cache(self.config.edgex_account_id)
+    
     async def start(self):
         """启动机器人"""
         try:
@@ -108,8 +323,7 @@ class GridTradingBot:
             await self._run_main_loop()
             
         except Exception as e:
-            self.logger.error(f"机器人运行失败: {e}")
-            self.logger.error(f"错误详情: {traceback.format_exc()}")
+            self.logger.error("机器人运行失败: %s", e, exc_info=True)
             
             if self.config.auto_restart and self.restart_count < self.max_restart_count:
                 self.should_restart = True
@@ -118,39 +332,79 @@ class GridTradingBot:
     
     async def _run_main_loop(self):
         """主运行循环"""
-        last_check_time = 0
+        error_count = 0  # 连续出错次数，用于计算退避时间
         
-        while self.is_running:
-            try:
-                current_time = time.time()
-                
-                # 检查是否到了检查时间
-                if current_time - last_check_time >= self.config.check_interval:
-                    await self.strategy.check_and_rebalance()
-                    last_check_time = current_time
-                
-                # 短暂休眠
-                await asyncio.sleep(1)
-                
-            except Exception as e:
-                self.logger.error(f"主循环运行错误: {e}")
-                
-                # 根据配置决定是否重试
-                retry_count = 0
-                while retry_count < self.config.max_retries:
-                    try:
-                        self.logger.log_error_with_retry(e, retry_count + 1, self.config.max_retries)
-                        await asyncio.sleep(5)  # 等待5秒后重试
+        # 循环内反复使用的属性和方法提前绑定到局部变量
+        check = self.strategy.check_and_rebalance
+        interval = self.config.check_interval
+        max_retries = self.config.max_retries
+        log_err = self.logger.error
+        wait = asyncio.wait
+        
+        # 停止和重载等待任务跨循环复用，只在触发后重新创建
+        stop_waiter = asyncio.ensure_future(self._stop_event.wait())
+        reload_waiter = None
+        check_due = True  # 启动或重启后立即检查一次，不必等待第一个检查间隔
+        
+        try:
+            while self.is_running:
+                try:
+                    if check_due:
+                        check_due = False
+                        await check()
+                        error_count = 0
+                    
+                    if reload_waiter is None:
+                        reload_waiter = asyncio.ensure_future(self._reload_event.wait())
+                    
+                    # 等待停止信号、重载信号或检查间隔到期
+                    done, _ = await wait(
+                        (stop_waiter, reload_waiter),
+                        timeout=interval,
+                        return_when=asyncio.FIRST_COMPLETED
+                    )
+                    
+                    if stop_waiter in done:
                         break
-                    except Exception as retry_error:
-                        retry_count += 1
-                        if retry_count >= self.config.max_retries:
-                            self.logger.error(f"重试次数已达上限，停止运行: {retry_error}")
-                            self.is_running = False
-                            break
-    
-    async def stop(self):
-        """停止机器人"""
+                    
+                    if reload_waiter in done:
+                        self._reload_event.clear()
+                        reload_waiter = None
+                        if await self.reload_config():
+                            interval = self.config.check_interval
+                            max_retries = self.config.max_retries
+                        continue
+                    
+                    check_due = True
+                    
+                except Exception as e:
+                    log_err(f"主循环运行错误: {e}")
+                    error_count += 1
+                    
+                    # 连续出错超过 max_retries 次时抛出，由 start() 按 auto_restart 决定是否重启
+                    if error_count > max_retries:
+                        log_err(f"连续出错次数已达上限: {e}")
+                        raise
+                    
+                    self.logger.log_error_with_retry(e, error_count, max_retries)
+                    
+                    # 指数退避，最长等待30秒；期间收到停止信号立即退出
+                    await wait((stop_waiter,), timeout=min(30, 2 ** error_count))
+                    if stop_waiter.done():
+                        break
+                    check_due = True
+        finally:
+            for waiter in (stop_waiter, reload_waiter):
+                if waiter is not None and not waiter.done():
+                    waiter.cancel()
+    
+    async def stop(self, close_client: bool = True):
+        """
+        停止机器人
+        
+        Args:
+            close_client: 是否关闭EdgeX客户端，重启时保留连接以便复用
+        """
         try:
             self.logger.info("正在停止网格交易机器人...")
             self.is_running = False
@@ -158,10 +412,12 @@ class GridTradingBot:
             # 取消所有活跃订单
             if self.strategy:
                 await self.strategy.cancel_all_orders()
+                self.strategy.stop_order_stream()
             
-            # 关闭EdgeX客户端
-            if self.edgex_client:
-                await self.edgex_client.close()
+            # 关闭本账户的EdgeX客户端
+            if close_client and self.edgex_client:
+                await close_shared_client(self.config)
+                self.edgex_client = None
             
             self.logger.info("网格交易机器人已停止")
             
@@ -169,33 +425,41 @@ class GridTradingBot:
             self.logger.error(f"停止机器人时出错: {e}")
     
     async def restart(self):
-        """重启机器人"""
-        try:
-            self.logger.info(f"正在重启机器人 (第{self.restart_count + 1}次)...")
+        """
+        重启机器人：停止当前运行并重新初始化（失败时按指数退避重试，直到达到重启上限）
+        
+        只负责重新初始化，重新启动由 run() 的主循环完成；
+        退避期间收到停止信号时直接返回，由 run() 检查停止事件后退出
+        """
+        while True:
+            backoff = min(300, 10 * 2 ** self.restart_count)
             self.restart_count += 1
             
-            # 停止当前运行
-            await self.stop()
-            
-            # 等待一段时间
-            await asyncio.sleep(10)
-            
-            # 重新初始化
-            await self.initialize()
-            
-            # 重新启动
-            self.should_restart = False
-            await self.start()
-            
-        except Exception as e:
-            self.logger.error(f"重启失败: {e}")
-            if self.restart_count < self.max_restart_count:
-                self.logger.info(f"将在30秒后再次尝试重启...")
-                await asyncio.sleep(30)
-                await self.restart()
-            else:
-                self.logger.critical("重启次数已达上限，机器人停止运行")
-                raise
+            try:
+                self.logger.info(f"正在重启机器人 (第{self.restart_count}次)，{backoff}秒后重新初始化...")
+                
+                # 停止当前运行（保留客户端连接）
+                await self.stop(close_client=False)
+                
+                # 等待退避时间，期间收到停止信号则放弃重启
+                try:
+                    await asyncio.wait_for(self._stop_event.wait(), timeout=backoff)
+                    self.logger.info("接收到停止信号，取消重启")
+                    self.should_restart = False
+                    return
+                except asyncio.TimeoutError:
+                    pass
+                
+                # 重新初始化，随后由 run() 重新启动
+                await self.initialize()
+                self.should_restart = False
+                return
+                
+            except Exception as e:
+                self.logger.error(f"重启失败: {e}")
+                if self.restart_count >= self.max_restart_count:
+                    self.logger.critical("重启次数已达上限，机器人停止运行")
+                    raise
     
     async def get_account_balance(self) -> dict:
         """
@@ -209,49 +473,9 @@ class GridTradingBot:
                 raise ValueError("EdgeX客户端未初始化")
             
             # 获取账户资产信息
-            assets_data = await self.edgex_client.get_account_asset()
+            data = await _get_account_asset(self.edgex_client, self.config)
             
-            if not assets_data or 'data' not in assets_data:
-                raise ValueError("无法获取账户资产信息")
-            
-            data = assets_data['data']
-            
-            # 解析余额信息
-            balance_info = {
-                'total_balance': '0',
-                'available_balance': '0',
-                'frozen_balance': '0',
-                'unrealized_pnl': '0',
-                'positions': []
-            }
-            
-            # 获取抵押品信息
-            collateral_list = data.get('collateralList', [])
-            if collateral_list:
-                collateral = collateral_list[0]  # 通常只有一个抵押品（USDC）
-                balance_info['total_balance'] = collateral.get('totalSize', '0')
-                balance_info['available_balance'] = collateral.get('availableSize', '0')
-                balance_info['frozen_balance'] = collateral.get('frozenSize', '0')
-            
-            # 获取持仓信息
-            position_list = data.get('positionList', [])
-            for position in position_list:
-                if position.get('openSize', '0') != '0':  # 只显示有持仓的合约
-                    balance_info['positions'].append({
-                        'contract_id': position.get('contractId', ''),
-                        'contract_name': position.get('contractName', ''),
-                        'open_size': position.get('openSize', '0'),
-                        'unrealized_pnl': position.get('unrealizedPnl', '0'),
-                        'margin': position.get('margin', '0')
-                    })
-            
-            # 计算总未实现盈亏
-            total_unrealized_pnl = sum(
-                float(pos['unrealized_pnl']) for pos in balance_info['positions']
-            )
-            balance_info['unrealized_pnl'] = str(total_unrealized_pnl)
-            
-            return balance_info
+            return _parse_assets(data)
             
         except Exception as e:
             self.logger.error(f"获取账户余额失败: {e}")
@@ -282,6 +506,10 @@ class GridTradingBot:
             await self.initialize()
             
             while True:
+                # 重启退避期间收到停止信号时不再启动，避免重新挂出整套网格订单
+                if self._stop_event.is_set():
+                    break
+                
                 try:
                     await self.start()
                     
@@ -312,73 +540,90 @@ class GridTradingBot:
 
 
 # 独立的余额查询函数
-async def get_balance(config_file: Optional[str] = None) -> dict:
+async def get_balance(config_file: Optional[str] = None,
+                      bot: Optional[GridTradingBot] = None) -> dict:
     """
     独立的余额查询函数
     
+    抵押品余额和持仓由同一个 get_account_asset 请求返回，整个查询只需一次往返
+    
     Args:
         config_file: 配置文件路径
+        bot: 已初始化的机器人实例，提供时直接复用其客户端和余额缓存
         
     Returns:
         dict: 余额信息
     """
+    if bot is not None and bot.edgex_client:
+        return await bot.get_account_balance()
+    
     config = GridTradingConfig(config_file)
     config.validate()
     
-    client = Client(
-        base_url=config.edgex_base_url,
-        account_id=int(config.edgex_account_id),
-        stark_private_key=config.edgex_stark_private_key
-    )
+    # 使用共享客户端，由调用方在退出前调用 close_shared_clients() 释放
+    client = await get_shared_client(config)
     
+    # 获取账户资产信息
+    data = await _get_account_asset(client, config)
+    
+    return _parse_assets(data)
+
+
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    """创建事件循环，安装了 uvloop（可选依赖）时优先使用"""
     try:
-        # 获取账户资产信息
-        assets_data = await client.get_account_asset()
-        
-        if not assets_data or 'data' not in assets_data:
-            raise ValueError("无法获取账户资产信息")
-        
-        data = assets_data['data']
-        
-        # 解析余额信息
-        balance_info = {
-            'total_balance': '0',
-            'available_balance': '0',
-            'frozen_balance': '0',
-            'unrealized_pnl': '0',
-            'positions': []
-        }
-        
-        # 获取抵押品信息
-        collateral_list = data.get('collateralList', [])
-        if collateral_list:
-            collateral = collateral_list[0]
-            balance_info['total_balance'] = collateral.get('totalSize', '0')
-            balance_info['available_balance'] = collateral.get('availableSize', '0')
-            balance_info['frozen_balance'] = collateral.get('frozenSize', '0')
-        
-        # 获取持仓信息
-        position_list = data.get('positionList', [])
-        for position in position_list:
-            if position.get('openSize', '0') != '0':
-                balance_info['positions'].append({
-                    'contract_id': position.get('contractId', ''),
-                    'contract_name': position.get('contractName', ''),
-                    'open_size': position.get('openSize', '0'),
-                    'unrealized_pnl': position.get('unrealizedPnl', '0'),
-                    'margin': position.get('margin', '0')
-                })
-        
-        # 计算总未实现盈亏
-        total_unrealized_pnl = sum(
-            float(pos['unrealized_pnl']) for pos in balance_info['positions']
-        )
-        balance_info['unrealized_pnl'] = str(total_unrealized_pnl)
+        import uvloop
+    except ImportError:
+        return asyncio.new_event_loop()
+    return uvloop.new_event_loop()
+
+
+def run_event_loop(coro):
+    """
+    在进程内共用的事件循环中运行协程，首次调用时创建循环
+    
+    进程退出前应调用 close_event_loop() 清理循环
+    
+    Args:
+        coro: 要运行的协程
         
-        return balance_info
+    Returns:
+        协程的返回值
+    """
+    global _event_loop
+    if _event_loop is None or _event_loop.is_closed():
+        _event_loop = _new_event_loop()
+        asyncio.set_event_loop(_event_loop)
+    
+    return _event_loop.run_until_complete(coro)
+
+
+def close_event_loop():
+    """
+    关闭 run_event_loop 共用的事件循环
+    
+    与 asyncio.run 的收尾一致：取消未完成的任务，关闭异步生成器，
+    并等待默认线程池（如 WebSocket 连接使用的线程）退出
+    """
+    global _event_loop
+    loop = _event_loop
+    if loop is None or loop.is_closed():
+        return
+    _event_loop = None
+    
+    try:
+        tasks = asyncio.all_tasks(loop)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
         
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        if hasattr(loop, 'shutdown_default_executor'):  # Python 3.9+
+            loop.run_until_complete(loop.shutdown_default_executor())
     finally:
-        await client.close()
+        asyncio.set_event_loop(None)
+        loop.close()
 
 
 if __name__ == "__main__":
@@ -387,4 +632,7 @@ if __name__ == "__main__":
         bot = GridTradingBot()
         await bot.run()
     
-    asyncio.run(main())
+    try:
+        run_event_loop(main())
+    finally:
+        close_event_loop()
@@ -5,14 +5,149 @@
 """
 
 import os
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation
 from typing import Dict, Any, Optional
 import json
 
+try:
+    import orjson  # 可选依赖，解析和序列化更快
+except ImportError:
+    orjson = None
+
+try:
+    import fastjsonschema  # 可选依赖，将配置文件的 JSON Schema 编译为校验函数
+except ImportError:
+    fastjsonschema = None
+
+
+# Decimal 字段既可写成数字，也可写成字符串（to_dict 以字符串保存以保留精度）；
+# exclusiveMinimum 只约束数字，字符串形式由 _check_decimal_fields 按 Decimal 解析后检查
+_DECIMAL_FIELD = {'type': ['number', 'string']}
+_POSITIVE_DECIMAL_FIELD = {'type': ['number', 'string'], 'exclusiveMinimum': 0}
+
+# Decimal 字段及其是否必须大于0
+_DECIMAL_FIELDS = {
+    'grid_spacing_percent': True,
+    'order_size': True,
+    'max_position_size': False,
+    'price_range_percent': False,
+    'stop_loss_percent': False,
+}
+
+# 配置文件的 JSON Schema，只约束各字段的类型和取值范围，字段均可省略（省略时使用默认值）
+CONFIG_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'edgex_base_url': {'type': 'string'},
+        'edgex_ws_url': {'type': 'string'},
+        'edgex_account_id': {'type': ['string', 'integer', 'null']},
+        'edgex_stark_private_key': {'type': ['string', 'null']},
+        'trading_pair': {'type': 'string', 'minLength': 1},
+        'grid_count': {'type': 'integer', 'minimum': 1},
+        'grid_spacing_percent': _POSITIVE_DECIMAL_FIELD,
+        'order_size': _POSITIVE_DECIMAL_FIELD,
+        'max_position_size': _DECIMAL_FIELD,
+        'price_range_percent': _DECIMAL_FIELD,
+        'stop_loss_percent': _DECIMAL_FIELD,
+        'check_interval': {'type': 'number', 'exclusiveMinimum': 0},
+        'max_retries': {'type': 'integer', 'minimum': 0},
+        'auto_restart': {'type': 'boolean'},
+        'balance_cache_ttl': {'type': 'number', 'minimum': 0},
+        'verify_connection_on_init': {'type': 'boolean'},
+        'use_websocket_orders': {'type': 'boolean'},
+        'rate_limit_rps': {'type': 'number', 'minimum': 0},  # 0 表示不限流
+        'status_log_interval': {'type': 'number', 'minimum': 0},
+        'log_level': {'type': 'string'},
+        'log_to_file': {'type': 'boolean'},
+    },
+}
+
+# 编译后的 CONFIG_SCHEMA 校验函数，首次校验时生成
+_config_validator = None
+
+
+def load_json_file(path: str) -> Any:
+    """读取 JSON 文件，安装了 orjson 时使用 orjson 解析"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_json_file(path: str, data: Any):
+    """以 2 空格缩进写入 JSON 文件，安装了 orjson 时使用 orjson 序列化"""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def validate_config_data(config_data: Any) -> None:
+    """
+    按 CONFIG_SCHEMA 校验配置文件内容，并检查 Decimal 字段能否解析
+    
+    安装了 fastjsonschema 时使用编译后的校验函数，否则跳过 Schema 检查，
+    其余字段检查仍由 GridTradingConfig.validate 完成
+    
+    Args:
+        config_data: 配置文件解析后的数据
+        
+    Raises:
+        ValueError: 配置文件内容不符合 CONFIG_SCHEMA
+    """
+    global _config_validator
+    if fastjsonschema is not None:
+        if _config_validator is None:
+            _config_validator = fastjsonschema.compile(CONFIG_SCHEMA)
+        
+        try:
+            _config_validator(config_data)
+        except fastjsonschema.JsonSchemaValueException as e:
+            raise ValueError(f"配置文件格式错误: {e.message}") from e
+    
+    if isinstance(config_data, dict):
+        _check_decimal_fields(config_data)
+
+
+def _check_decimal_fields(config_data: Dict[str, Any]) -> None:
+    """
+    按加载配置时的 _to_dec 解析 Decimal 字段，接受 Decimal 支持的全部写法（如 "1e-3"、".5"）
+    
+    Raises:
+        ValueError: 字段不是有限数字，或必须大于0的字段不大于0
+    """
+    for name, positive in _DECIMAL_FIELDS.items():
+        value = config_data.get(name)
+        if value is None:
+            continue
+        
+        try:
+            dec = _to_dec(value)
+        except (InvalidOperation, TypeError, ValueError):
+            dec = None
+        if dec is None or not dec.is_finite():
+            raise ValueError(f"配置文件格式错误: {name} 不是有效的数字: {value!r}")
+        
+        if positive and dec <= 0:
+            raise ValueError(f"配置文件格式错误: {name} 必须大于0")
+
+
+def _to_dec(value: Any) -> Decimal:
+    """将配置值转换为Decimal，整数和字符串直接构造，浮点数经 repr 转换以保留书写精度"""
+    if isinstance(value, (int, str)):
+        return Decimal(value)
+    return Decimal(repr(value))
+
 
 class GridTradingConfig:
     """网格交易配置类"""
     
+    # to_dict() 的缓存结果，任一配置项被修改时失效
+    _cached_dict: Optional[Dict[str, Any]] = None
+    
     def __init__(self, config_file: Optional[str] = None):
         """
         初始化配置
@@ -20,16 +155,40 @@ class GridTradingConfig:
         Args:
             config_file: 配置文件路径，如果为None则使用环境变量
         """
-        if config_file and os.path.exists(config_file):
-            self._load_from_file(config_file)
+        if config_file:
+            try:
+                self._load_from_file(config_file)
+            except FileNotFoundError:
+                self._load_from_env()
         else:
             self._load_from_env()
     
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+        if not name.startswith('_'):
+            super().__setattr__('_cached_dict', None)
+    
+    @classmethod
+    def from_dict(cls, config_data: Dict[str, Any]) -> 'GridTradingConfig':
+        """
+        由已解析的配置文件内容创建配置，避免重复读取文件
+        
+        Args:
+            config_data: 配置文件解析后的数据
+            
+        Returns:
+            GridTradingConfig: 配置对象
+        """
+        config = cls.__new__(cls)
+        config._load_from_dict(config_data)
+        return config
+    
     def _load_from_file(self, config_file: str):
         """从配置文件加载配置"""
-        with open(config_file, 'r', encoding='utf-8') as f:
-            config_data = json.load(f)
-        
+        self._load_from_dict(load_json_file(config_file))
+    
+    def _load_from_dict(self, config_data: Dict[str, Any]):
+        """从配置文件内容加载配置"""
         # EdgeX API 配置
         self.edgex_base_url = config_data.get('edgex_base_url', 'https://pro.edgex.exchange')
         self.edgex_ws_url = config_data.get('edgex_ws_url', 'wss://quote.edgex.exchange')
@@ -39,18 +198,23 @@ class GridTradingConfig:
         # 交易配置
         self.trading_pair = config_data.get('trading_pair', 'ETH')  # 交易对，如 ETH, BTC
         self.grid_count = config_data.get('grid_count', 10)  # 网格数量
-        self.grid_spacing_percent = Decimal(str(config_data.get('grid_spacing_percent', 0.5)))  # 网格间距百分比
-        self.order_size = Decimal(str(config_data.get('order_size', 0.01)))  # 每个网格的订单大小
-        self.max_position_size = Decimal(str(config_data.get('max_position_size', 0.1)))  # 最大持仓大小
+        self.grid_spacing_percent = _to_dec(config_data.get('grid_spacing_percent', 0.5))  # 网格间距百分比
+        self.order_size = _to_dec(config_data.get('order_size', 0.01))  # 每个网格的订单大小
+        self.max_position_size = _to_dec(config_data.get('max_position_size', 0.1))  # 最大持仓大小
         
         # 风险控制
-        self.price_range_percent = Decimal(str(config_data.get('price_range_percent', 5.0)))  # 价格范围百分比
-        self.stop_loss_percent = Decimal(str(config_data.get('stop_loss_percent', 10.0)))  # 止损百分比
+        self.price_range_percent = _to_dec(config_data.get('price_range_percent', 5.0))  # 价格范围百分比
+        self.stop_loss_percent = _to_dec(config_data.get('stop_loss_percent', 10.0))  # 止损百分比
         
         # 机器人运行配置
         self.check_interval = config_data.get('check_interval', 5)  # 检查间隔（秒）
         self.max_retries = config_data.get('max_retries', 3)  # 最大重试次数
         self.auto_restart = config_data.get('auto_restart', True)  # 自动重启
+        self.balance_cache_ttl = float(config_data.get('balance_cache_ttl', 1.0))  # 余额缓存有效期（秒）
+        self.verify_connection_on_init = config_data.get('verify_connection_on_init', False)  # 初始化时测试连接
+        self.use_websocket_orders = config_data.get('use_websocket_orders', True)  # 通过 WebSocket 推送跟踪订单
+        self.rate_limit_rps = float(config_data.get('rate_limit_rps', 20))  # API 请求频率上限（次/秒）
+        self.status_log_interval = float(config_data.get('status_log_interval', 10.0))  # 网格状态日志间隔（秒）
         
         # 日志配置
         self.log_level = config_data.get('log_level', 'INFO')
@@ -79,6 +243,11 @@ class GridTradingConfig:
         self.check_interval = int(os.getenv('CHECK_INTERVAL', '5'))
         self.max_retries = int(os.getenv('MAX_RETRIES', '3'))
         self.auto_restart = os.getenv('AUTO_RESTART', 'true').lower() == 'true'
+        self.balance_cache_ttl = float(os.getenv('BALANCE_CACHE_TTL', '1.0'))
+        self.verify_connection_on_init = os.getenv('VERIFY_CONNECTION_ON_INIT', 'false').lower() == 'true'
+        self.use_websocket_orders = os.getenv('USE_WEBSOCKET_ORDERS', 'true').lower() == 'true'
+        self.rate_limit_rps = float(os.getenv('RATE_LIMIT_RPS', '20'))
+        self.status_log_interval = float(os.getenv('STATUS_LOG_INTERVAL', '10.0'))
         
         # 日志配置
         self.log_level = os.getenv('LOG_LEVEL', 'INFO')
@@ -100,9 +269,27 @@ class GridTradingConfig:
         
         if self.grid_spacing_percent <= 0:
             raise ValueError("网格间距百分比必须大于0")
+        
+        if self.check_interval <= 0:
+            raise ValueError("检查间隔必须大于0")
+        
+        if self.rate_limit_rps < 0:
+            raise ValueError("API 请求频率上限不能为负数（0 表示不限流）")
+        
+        if self.balance_cache_ttl < 0:
+            raise ValueError("余额缓存有效期不能为负数")
+        
+        if self.status_log_interval < 0:
+            raise ValueError("网格状态日志间隔不能为负数")
     
     def to_dict(self) -> Dict[str, Any]:
-        """将配置转换为字典"""
+        """将配置转换为字典（结果会被缓存，返回其浅拷贝）"""
+        if self._cached_dict is None:
+            self._cached_dict = self._build_dict()
+        return dict(self._cached_dict)
+    
+    def _build_dict(self) -> Dict[str, Any]:
+        """构建配置字典，Decimal 字段以字符串保存以保留精度"""
         return {
             'edgex_base_url': self.edgex_base_url,
             'edgex_ws_url': self.edgex_ws_url,
@@ -110,19 +297,23 @@ class GridTradingConfig:
             'edgex_stark_private_key': self.edgex_stark_private_key,
             'trading_pair': self.trading_pair,
             'grid_count': self.grid_count,
-            'grid_spacing_percent': float(self.grid_spacing_percent),
-            'order_size': float(self.order_size),
-            'max_position_size': float(self.max_position_size),
-            'price_range_percent': float(self.price_range_percent),
-            'stop_loss_percent': float(self.stop_loss_percent),
+            'grid_spacing_percent': str(self.grid_spacing_percent),
+            'order_size': str(self.order_size),
+            'max_position_size': str(self.max_position_size),
+            'price_range_percent': str(self.price_range_percent),
+            'stop_loss_percent': str(self.stop_loss_percent),
             'check_interval': self.check_interval,
             'max_retries': self.max_retries,
             'auto_restart': self.auto_restart,
+            'balance_cache_ttl': self.balance_cache_ttl,
+            'verify_connection_on_init': self.verify_connection_on_init,
+            'use_websocket_orders': self.use_websocket_orders,
+            'rate_limit_rps': self.rate_limit_rps,
+            'status_log_interval': self.status_log_interval,
             'log_level': self.log_level,
             'log_to_file': self.log_to_file
         }
     
     def save_to_file(self, config_file: str):
         """将配置保存到文件"""
-        with open(config_file, 'w', encoding='utf-8') as f:
-            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        save_json_file(config_file, self.to_dict())
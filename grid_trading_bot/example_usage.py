@@ -5,15 +5,15 @@
 演示如何使用网格交易机器人的各种功能
 """
 
-import asyncio
+import os
 import sys
-from pathlib import Path
 
 # 添加项目路径
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
-from grid_trading_bot.bot import GridTradingBot, get_balance
+from grid_trading_bot.bot import GridTradingBot, get_balance, close_shared_clients, run_event_loop, close_event_loop
 from grid_trading_bot.config import GridTradingConfig
 
 
@@ -200,7 +200,12 @@ async def main():
         print(f"示例运行失败: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        await close_shared_clients()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        run_event_loop(main())
+    finally:
+        close_event_loop()
@@ -5,26 +5,92 @@
 """
 
 import asyncio
+import bisect
+import json
+import sys
 from decimal import Decimal, ROUND_DOWN
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, Optional, Tuple
 from dataclasses import dataclass
 import time
 
-from edgex_sdk import OrderSide, CancelOrderParams, GetOrderBookDepthParams
+from edgex_sdk import OrderSide, CancelOrderParams, GetOrderBookDepthParams, WebSocketManager
 from .logger import GridTradingLogger
+from .rate_limiter import RateLimiter, is_rate_limit_error
 
 
-@dataclass
+# 单次订单查询请求包含的最大订单数
+ORDER_QUERY_BATCH_SIZE = 10
+
+# 并发订单查询请求数上限
+MAX_CONCURRENT_QUERIES = 5
+
+# 单次轮询查询的订单数上限，None 表示每次查询全部活跃订单；
+# 设置上限时按轮转方式覆盖全部订单
+MAX_ORDERS_PER_POLL: Optional[int] = None
+
+# 并发下单请求数上限
+MAX_CONCURRENT_ORDERS = 10
+
+# 逐个撤单时的并发请求数上限
+MAX_CONCURRENT_CANCELS = 20
+
+# 触发交易所限流（HTTP 429）后暂停请求的时长（秒）
+RATE_LIMIT_BACKOFF = 1.0
+
+# 止损检查中价格变动与阈值相差不足该百分点时，改用 Decimal 精确比较
+STOP_LOSS_EXACT_BAND = 0.5
+
+# 合约元数据缓存有效期（秒）
+METADATA_CACHE_TTL = 60
+
+# 订单推送连接正常时，仍按该间隔（秒）轮询一次活跃订单，补上遗漏的推送并发现静默中断的连接
+ORDER_RECONCILE_INTERVAL = 30.0
+
+# 合约元数据缓存，按 base_url 保存 (获取时间, {合约名称: 合约信息})
+_metadata_cache: Dict[str, Tuple[float, Dict[str, dict]]] = {}
+
+# Python 3.10+ 的 dataclass 支持 slots，去掉实例 __dict__ 以节省内存、加快属性访问
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+def _compute_grid_ticks(center_ticks: int, range_ticks: int, grid_count: int) -> List[int]:
+    """
+    计算各网格级别的 tick 数（升序、去重，不含非正值）
+    
+    纯整数运算，不构造 Decimal；级别均匀分布在 [中心 - 范围, 中心 + 范围] 内，
+    间距不能整除时把余数分摊到各个间距上，两端级别恰好落在范围边缘
+    
+    Args:
+        center_ticks: 中心价格对应的 tick 数
+        range_ticks: 中心价格到网格边缘的 tick 数
+        grid_count: 网格数量
+        
+    Returns:
+        List[int]: 各网格级别的 tick 数
+    """
+    start_ticks = center_ticks - range_ticks
+    span_ticks = range_ticks * 2
+    
+    # 范围不足 grid_count 个 tick 时相邻级别会落在同一 tick 上，按顺序去重
+    grid_ticks = dict.fromkeys(start_ticks + i * span_ticks // grid_count for i in range(grid_count + 1))
+    
+    # 确保价格为正：跳过非正的级别
+    return [ticks for ticks in grid_ticks if ticks > 0]
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class GridLevel:
     """网格级别数据类"""
     price: Decimal
+    ticks: int = 0  # 价格对应的 tick_size 整数倍，用于快速比较
+    price_str: str = ''  # 下单用的价格字符串，避免每次下单重复转换
     buy_order_id: Optional[str] = None
     sell_order_id: Optional[str] = None
     is_buy_filled: bool = False
     is_sell_filled: bool = False
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class OrderInfo:
     """订单信息数据类"""
     order_id: str
@@ -53,13 +119,27 @@ class GridTradingStrategy:
         
         # 网格相关
         self.grid_levels: List[GridLevel] = []
+        self._grid_ticks: List[int] = []  # 与 grid_levels 平行的升序 tick 数组，用于二分划分
+        self.buy_candidates: List[GridLevel] = []  # 中心价格下方可挂买单的级别
+        self.sell_candidates: List[GridLevel] = []  # 中心价格上方可挂卖单的级别
+        self._partition: Optional[Tuple[int, int]] = None  # 当前划分边界，None 表示需要重新划分
         self.center_price: Optional[Decimal] = None
+        self.center_ticks: float = 0.0  # 中心价格对应的 tick 数
         self.contract_id: Optional[str] = None
         self.tick_size: Optional[Decimal] = None
         
         # 状态跟踪
         self.active_orders: Dict[str, OrderInfo] = {}
+        self._buy_order_to_level: Dict[str, GridLevel] = {}  # 买单ID -> 网格级别
+        self._sell_order_to_level: Dict[str, GridLevel] = {}  # 卖单ID -> 网格级别
+        self._query_semaphore = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+        self._order_poll_cursor = 0  # 限制单次查询数量时的轮转位置
+        self.limiter = RateLimiter(config.rate_limit_rps)
+        self._order_size_str = str(config.order_size)  # 下单用的数量字符串
         self.position_size: Decimal = Decimal('0')
+        self._position_estimate: Decimal = Decimal('0')  # 持仓加上本地已知的后续成交
+        self._abs_pos: Decimal = Decimal('0')
+        self._can_trade = True  # 持仓未达上限，允许挂单
         self.total_profit: Decimal = Decimal('0')
         
         # 价格跟踪
@@ -74,6 +154,16 @@ class GridTradingStrategy:
         # 运行状态
         self.is_running = False
         self.last_price_update = 0
+        self._last_status_log = 0.0  # 上次输出网格状态日志的时间
+        
+        # 订单成交回调
+        self.on_order_filled: Optional[Callable[[OrderInfo], None]] = None
+        
+        # WebSocket 订单推送
+        self._ws_manager: Optional[WebSocketManager] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._order_stream_connected = False
+        self._last_order_reconcile = 0.0  # 上次轮询活跃订单的时间
         
     async def initialize(self):
         """初始化策略"""
@@ -92,6 +182,9 @@ class GridTradingStrategy:
             # 获取当前持仓
             await self._update_position()
             
+            # 订阅订单推送
+            await self._start_order_stream()
+            
             self.logger.info(f"策略初始化完成 - 交易对: {self.config.trading_pair}, "
                            f"中心价格: {self.center_price}, 网格数量: {self.config.grid_count}")
             
@@ -99,30 +192,92 @@ class GridTradingStrategy:
             self.logger.error(f"策略初始化失败: {e}")
             raise
     
+    async def apply_config(self, config):
+        """
+        应用重新加载的配置
+        
+        网格形状相关参数变化时撤销现有订单并重新计算网格，下一次重新平衡时补单
+        
+        Args:
+            config: 新的配置对象
+        """
+        grid_changed = (config.grid_count != self.config.grid_count or
+                        config.price_range_percent != self.config.price_range_percent)
+        self.config = config
+        self._order_size_str = str(config.order_size)
+        self._refresh_position_limit(self._position_estimate)
+        
+        # 调整现有限流器而不是重建，保留正在等待的请求和限流退避状态
+        if config.rate_limit_rps != self.limiter.rate:
+            self.limiter.set_rate(config.rate_limit_rps)
+        
+        if grid_changed:
+            self.logger.info("网格参数已变更，重新布置网格...")
+            await self.cancel_all_orders()
+            self._calculate_grid_levels()
+    
+    async def _call_api(self, func, *args, **kwargs):
+        """
+        经限流器调用交易所API，遇到限流响应时暂停后续请求
+        
+        Args:
+            func: SDK 的异步方法
+            *args, **kwargs: 传给 func 的参数
+            
+        Returns:
+            func 的返回值
+        """
+        async with self.limiter:
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                if is_rate_limit_error(e):
+                    self.logger.warning(f"触发交易所限流，暂停请求 {RATE_LIMIT_BACKOFF} 秒")
+                    self.limiter.penalize(RATE_LIMIT_BACKOFF)
+                raise
+    
+    async def _get_contracts(self) -> Dict[str, dict]:
+        """
+        获取按合约名称索引的合约信息，METADATA_CACHE_TTL 内复用上一次的结果
+        
+        tickSize 和 minOrderSize 在建表时即解析为 Decimal
+        
+        Returns:
+            Dict[str, dict]: 合约名称 -> 合约信息
+        """
+        base_url = self.config.edgex_base_url
+        cached = _metadata_cache.get(base_url)
+        if cached and time.monotonic() - cached[0] < METADATA_CACHE_TTL:
+            return cached[1]
+        
+        metadata = await self.client.get_metadata()
+        if not metadata or 'data' not in metadata:
+            raise ValueError("无法获取交易所元数据")
+        
+        contracts = {}
+        for contract in metadata['data'].get('contractList', []):
+            contract = dict(contract)
+            contract['tickSize'] = Decimal(contract['tickSize'])
+            contract['minOrderSize'] = Decimal(contract.get('minOrderSize', '0'))
+            contracts[contract.get('contractName')] = contract
+        
+        _metadata_cache[base_url] = (time.monotonic(), contracts)
+        return contracts
+    
     async def _get_contract_info(self):
         """获取合约信息"""
         try:
-            metadata = await self.client.get_metadata()
-            if not metadata or 'data' not in metadata:
-                raise ValueError("无法获取交易所元数据")
-            
-            contract_list = metadata['data'].get('contractList', [])
-            target_contract = None
-            
-            # 查找目标合约
-            for contract in contract_list:
-                if contract.get('contractName') == f"{self.config.trading_pair}USD":
-                    target_contract = contract
-                    break
+            contract_name = f"{self.config.trading_pair}USD"
+            target_contract = (await self._get_contracts()).get(contract_name)
             
             if not target_contract:
-                raise ValueError(f"找不到交易对 {self.config.trading_pair}USD 的合约")
+                raise ValueError(f"找不到交易对 {contract_name} 的合约")
             
             self.contract_id = target_contract['contractId']
-            self.tick_size = Decimal(target_contract['tickSize'])
+            self.tick_size = target_contract['tickSize']
             
             # 验证订单大小是否满足最小要求
-            min_order_size = Decimal(target_contract.get('minOrderSize', '0'))
+            min_order_size = target_contract['minOrderSize']
             if self.config.order_size < min_order_size:
                 raise ValueError(f"订单大小 {self.config.order_size} 小于最小要求 {min_order_size}")
             
@@ -138,7 +293,7 @@ class GridTradingStrategy:
         try:
             # 获取订单簿数据
             depth_params = GetOrderBookDepthParams(contract_id=self.contract_id, limit=15)
-            order_book = await self.client.quote.get_order_book_depth(depth_params)
+            order_book = await self._call_api(self.client.quote.get_order_book_depth, depth_params)
             
             if not order_book or 'data' not in order_book:
                 raise ValueError("无法获取订单簿数据")
@@ -164,11 +319,13 @@ class GridTradingStrategy:
             # 计算中间价作为中心价格
             self.current_mid_price = (self.current_bid + self.current_ask) / 2
             self.center_price = self.current_mid_price
+            if self.tick_size:
+                self.center_ticks = float(self.center_price / self.tick_size)
             
             self.last_price_update = time.time()
             
-            self.logger.debug(f"价格更新 - 买价: {self.current_bid}, "
-                            f"卖价: {self.current_ask}, 中间价: {self.current_mid_price}")
+            self.logger.debug("价格更新 - 买价: %s, 卖价: %s, 中间价: %s",
+                              self.current_bid, self.current_ask, self.current_mid_price)
             
         except Exception as e:
             self.logger.error(f"更新中心价格失败: {e}")
@@ -179,29 +336,56 @@ class GridTradingStrategy:
         if not self.center_price:
             raise ValueError("中心价格未设置")
         
-        self.grid_levels.clear()
+        # 以 tick 数为单位计算，避免逐级的 Decimal 运算
+        tick_size = self.tick_size
+        center_ticks = int(self.center_price / tick_size)
         
         # 计算价格范围
-        price_range = self.center_price * self.config.price_range_percent / 100
-        
-        # 计算网格间距
-        grid_spacing = price_range * 2 / self.config.grid_count
-        
-        # 生成网格级别
-        for i in range(self.config.grid_count + 1):
-            price = self.center_price - price_range + (i * grid_spacing)
-            # 调整到tick_size的整数倍
-            price = self._round_to_tick_size(price)
-            
-            if price > 0:  # 确保价格为正
-                self.grid_levels.append(GridLevel(price=price))
+        range_ticks = int(self.center_price * self.config.price_range_percent / 100 / tick_size)
         
-        # 按价格排序
-        self.grid_levels.sort(key=lambda x: x.price)
+        # 生成网格级别（tick 数单调递增，结果天然按价格升序，无需再排序）
+        grid_levels = []
+        for ticks in _compute_grid_ticks(center_ticks, range_ticks, self.config.grid_count):
+            price = ticks * tick_size
+            grid_levels.append(GridLevel(price=price, ticks=ticks, price_str=str(price)))
+        self.grid_levels = grid_levels
+        self._grid_ticks = [gl.ticks for gl in self.grid_levels]
+        self._partition = None
         
         self.logger.info(f"网格级别计算完成 - 共{len(self.grid_levels)}个级别, "
                         f"价格范围: {self.grid_levels[0].price} - {self.grid_levels[-1].price}")
     
+    def _split_grid(self) -> Tuple[List[GridLevel], List[GridLevel]]:
+        """
+        按中心价格把网格划分为买单候选和卖单候选，跳过中心价格附近的级别
+        
+        grid_ticks 升序，二分查找即可得到两侧边界，无需逐级比较；
+        中心价格未越过相邻级别时沿用上次的划分结果
+        
+        Returns:
+            Tuple[List[GridLevel], List[GridLevel]]: (中心下方级别, 中心上方级别)
+        """
+        grid_ticks = self._grid_ticks
+        # 距中心不足2个tick的级别不挂单，避免立即成交
+        buy_bound = self.center_ticks - 2
+        sell_bound = self.center_ticks + 2
+        
+        if self._partition is not None:
+            buy_end, sell_start = self._partition
+            # 边界两侧的级别仍落在原来一侧则划分不变
+            if ((buy_end == 0 or grid_ticks[buy_end - 1] <= buy_bound) and
+                    (buy_end == len(grid_ticks) or grid_ticks[buy_end] > buy_bound) and
+                    (sell_start == 0 or grid_ticks[sell_start - 1] < sell_bound) and
+                    (sell_start == len(grid_ticks) or grid_ticks[sell_start] >= sell_bound)):
+                return self.buy_candidates, self.sell_candidates
+        
+        buy_end = bisect.bisect_right(grid_ticks, buy_bound)
+        sell_start = bisect.bisect_left(grid_ticks, sell_bound)
+        self._partition = (buy_end, sell_start)
+        self.buy_candidates = self.grid_levels[:buy_end]
+        self.sell_candidates = self.grid_levels[sell_start:]
+        return self.buy_candidates, self.sell_candidates
+    
     def _round_to_tick_size(self, price: Decimal) -> Decimal:
         """将价格调整到tick_size的整数倍"""
         if not self.tick_size:
@@ -209,39 +393,67 @@ class GridTradingStrategy:
         
         return (price / self.tick_size).quantize(Decimal('1'), rounding=ROUND_DOWN) * self.tick_size
     
-    async def _update_position(self):
-        """更新当前持仓"""
-        try:
-            positions_data = await self.client.get_account_positions()
-            if not positions_data or 'data' not in positions_data:
-                self.position_size = Decimal('0')
-                await self._update_entry_price()  # 更新开仓价格
-                return
+    def _find_position(self, positions_data: Optional[dict]) -> Optional[dict]:
+        """
+        从持仓查询结果中找出当前合约的持仓
+        
+        Args:
+            positions_data: get_account_positions 的返回值
             
-            positions = positions_data.get('data', {}).get('positionList', [])
-            current_position = Decimal('0')
+        Returns:
+            Optional[dict]: 当前合约的持仓数据，没有持仓时返回 None
+        """
+        if not positions_data or 'data' not in positions_data:
+            return None
+        
+        contract_id = self.contract_id
+        for position in (positions_data.get('data') or {}).get('positionList', []):
+            if position.get('contractId') == contract_id:
+                return position
+        return None
+    
+    async def _update_position(self, positions_data: Optional[dict] = None):
+        """
+        更新当前持仓
+        
+        Args:
+            positions_data: 已获取的持仓查询结果，为 None 时重新查询
+        """
+        try:
+            if positions_data is None:
+                positions_data = await self._call_api(self.client.get_account_positions)
+            position = self._find_position(positions_data)
             
-            for position in positions:
-                if position.get('contractId') == self.contract_id:
-                    open_size = Decimal(position.get('openSize', '0'))
-                    # 如果是负数表示空头持仓，正数表示多头持仓
-                    current_position = open_size
-                    break
+            # 如果是负数表示空头持仓，正数表示多头持仓
+            current_position = Decimal(position.get('openSize', '0')) if position else Decimal('0')
             
             # 检查持仓是否发生变化
             position_changed = self.position_size != current_position
             self.position_size = current_position
+            self._refresh_position_limit(current_position)
             
-            # 如果持仓发生变化，更新开仓价格
+            # 如果持仓发生变化，用同一份持仓数据更新开仓价格
             if position_changed:
-                await self._update_entry_price()
+                await self._update_entry_price(position)
             
-            self.logger.debug(f"当前持仓更新: {self.position_size}")
+            self.logger.debug("当前持仓更新: %s", self.position_size)
             
         except Exception as e:
             self.logger.error(f"更新持仓失败: {e}")
             # 不抛出异常，使用默认值
             self.position_size = Decimal('0')
+            self._refresh_position_limit(self.position_size)
+    
+    def _refresh_position_limit(self, position: Decimal):
+        """
+        根据带符号的持仓重新计算持仓上限检查结果，供下单时直接读取
+        
+        Args:
+            position: 带符号的持仓（负数为空头）
+        """
+        self._position_estimate = position
+        self._abs_pos = abs(position)
+        self._can_trade = self._abs_pos < self.config.max_position_size
     
     async def place_grid_orders(self):
         """放置网格订单"""
@@ -251,22 +463,13 @@ class GridTradingStrategy:
             # 获取当前活跃订单
             await self._update_active_orders()
             
-            # 为每个网格级别放置订单
-            for i, grid_level in enumerate(self.grid_levels):
-                # 跳过中心价格附近的级别，避免立即成交
-                if abs(grid_level.price - self.center_price) < self.tick_size * 2:
-                    continue
-                
-                # 放置买单（在当前价格下方）
-                if grid_level.price < self.center_price and not grid_level.buy_order_id:
-                    await self._place_buy_order(grid_level)
-                
-                # 放置卖单（在当前价格上方）
-                if grid_level.price > self.center_price and not grid_level.sell_order_id:
-                    await self._place_sell_order(grid_level)
-                
-                # 添加延迟避免频率限制
-                await asyncio.sleep(0.1)
+            # 收集需要放置订单的网格级别：买单在当前价格下方，卖单在上方
+            buy_side, sell_side = self._split_grid()
+            buy_levels = [gl for gl in buy_side if not gl.buy_order_id]
+            sell_levels = [gl for gl in sell_side if not gl.sell_order_id]
+            
+            # 并发放置订单
+            await self._place_orders(buy_levels, sell_levels)
             
             self.logger.info(f"网格订单放置完成 - 活跃订单数: {len(self.active_orders)}")
             
@@ -274,18 +477,51 @@ class GridTradingStrategy:
             self.logger.error(f"放置网格订单失败: {e}")
             raise
     
+    async def _place_orders(self, buy_levels: List[GridLevel], sell_levels: List[GridLevel]):
+        """
+        并发放置买单和卖单
+        
+        待下订单放入队列，由固定数量的工作协程依次取出提交，并发数不超过
+        MAX_CONCURRENT_ORDERS，网格再大也不会为每个订单单独创建任务
+        
+        Args:
+            buy_levels: 需要放置买单的网格级别
+            sell_levels: 需要放置卖单的网格级别
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        for grid_level in buy_levels:
+            queue.put_nowait((self._place_buy_order, grid_level))
+        for grid_level in sell_levels:
+            queue.put_nowait((self._place_sell_order, grid_level))
+        
+        if queue.empty():
+            return
+        
+        async def worker():
+            # 队列在启动前已填满，取空即退出
+            while not queue.empty():
+                place_order, grid_level = queue.get_nowait()
+                try:
+                    await place_order(grid_level)
+                except Exception as e:
+                    self.logger.warning(f"放置订单失败: {e}")
+        
+        worker_count = min(queue.qsize(), MAX_CONCURRENT_ORDERS)
+        await asyncio.gather(*(worker() for _ in range(worker_count)))
+    
     async def _place_buy_order(self, grid_level: GridLevel):
         """放置买单"""
         try:
             # 检查持仓限制
-            if abs(self.position_size) >= self.config.max_position_size:
-                self.logger.debug(f"持仓已达上限，跳过买单 - 当前持仓: {self.position_size}")
+            if not self._can_trade:
+                self.logger.debug("持仓已达上限，跳过买单 - 当前持仓: %s", self.position_size)
                 return
             
-            order_result = await self.client.create_limit_order(
+            order_result = await self._call_api(
+                self.client.create_limit_order,
                 contract_id=self.contract_id,
-                size=str(self.config.order_size),
-                price=str(grid_level.price),
+                size=self._order_size_str,
+                price=grid_level.price_str,
                 side=OrderSide.BUY,
                 post_only=True
             )
@@ -294,6 +530,7 @@ class GridTradingStrategy:
                 order_id = order_result['data'].get('orderId')
                 if order_id:
                     grid_level.buy_order_id = order_id
+                    self._buy_order_to_level[order_id] = grid_level
                     self.active_orders[order_id] = OrderInfo(
                         order_id=order_id,
                         side='buy',
@@ -301,8 +538,8 @@ class GridTradingStrategy:
                         size=self.config.order_size,
                         status='OPEN'
                     )
-                    self.logger.debug(f"买单放置成功 - 价格: {grid_level.price}, "
-                                    f"数量: {self.config.order_size}, 订单ID: {order_id}")
+                    self.logger.debug("买单放置成功 - 价格: %s, 数量: %s, 订单ID: %s",
+                                      grid_level.price, self.config.order_size, order_id)
             
         except Exception as e:
             self.logger.warning(f"放置买单失败 - 价格: {grid_level.price}, 错误: {e}")
@@ -311,14 +548,15 @@ class GridTradingStrategy:
         """放置卖单"""
         try:
             # 检查持仓限制
-            if abs(self.position_size) >= self.config.max_position_size:
-                self.logger.debug(f"持仓已达上限，跳过卖单 - 当前持仓: {self.position_size}")
+            if not self._can_trade:
+                self.logger.debug("持仓已达上限，跳过卖单 - 当前持仓: %s", self.position_size)
                 return
             
-            order_result = await self.client.create_limit_order(
+            order_result = await self._call_api(
+                self.client.create_limit_order,
                 contract_id=self.contract_id,
-                size=str(self.config.order_size),
-                price=str(grid_level.price),
+                size=self._order_size_str,
+                price=grid_level.price_str,
                 side=OrderSide.SELL,
                 post_only=True
             )
@@ -327,6 +565,7 @@ class GridTradingStrategy:
                 order_id = order_result['data'].get('orderId')
                 if order_id:
                     grid_level.sell_order_id = order_id
+                    self._sell_order_to_level[order_id] = grid_level
                     self.active_orders[order_id] = OrderInfo(
                         order_id=order_id,
                         side='sell',
@@ -334,8 +573,8 @@ class GridTradingStrategy:
                         size=self.config.order_size,
                         status='OPEN'
                     )
-                    self.logger.debug(f"卖单放置成功 - 价格: {grid_level.price}, "
-                                    f"数量: {self.config.order_size}, 订单ID: {order_id}")
+                    self.logger.debug("卖单放置成功 - 价格: %s, 数量: %s, 订单ID: %s",
+                                      grid_level.price, self.config.order_size, order_id)
             
         except Exception as e:
             self.logger.warning(f"放置卖单失败 - 价格: {grid_level.price}, 错误: {e}")
@@ -346,35 +585,166 @@ class GridTradingStrategy:
             if not self.active_orders:
                 return
             
-            # 获取所有活跃订单的ID
+            # 获取活跃订单的ID
             order_ids = list(self.active_orders.keys())
+            if MAX_ORDERS_PER_POLL and len(order_ids) > MAX_ORDERS_PER_POLL:
+                # 从上次的位置继续，保证所有订单轮流被查询到
+                start = self._order_poll_cursor % len(order_ids)
+                order_ids = (order_ids[start:] + order_ids[:start])[:MAX_ORDERS_PER_POLL]
+                self._order_poll_cursor = start + MAX_ORDERS_PER_POLL
             
             # 批量查询订单状态
-            for order_id in order_ids[:10]:  # 限制批量查询数量
-                try:
-                    order_result = await self.client.order.get_order_by_id([order_id])
-                    if order_result and 'data' in order_result:
-                        order_list = order_result['data']
-                        if order_list:
-                            order_data = order_list[0]
-                            order_info = self.active_orders.get(order_id)
-                            if order_info:
-                                order_info.status = order_data.get('status', 'UNKNOWN')
-                                order_info.filled_size = Decimal(order_data.get('cumMatchSize', '0'))
-                                
-                                # 如果订单已完成或取消，从活跃订单中移除
-                                if order_info.status in ['FILLED', 'CANCELED']:
-                                    self._handle_order_completion(order_info)
-                except Exception as e:
-                    self.logger.debug(f"查询订单状态失败 - 订单ID: {order_id}, 错误: {e}")
-                
-                await asyncio.sleep(0.05)  # 避免频率限制
+            order_list = await self._query_orders(order_ids)
+            
+            # 先收集本轮已完成的订单，遍历结束后统一处理
+            completed = []
+            for order_data in order_list:
+                order_info = self._apply_order_data(order_data)
+                if order_info:
+                    completed.append(order_info)
+            
+            if completed:
+                self._complete_orders(completed)
+                self.logger.debug("本轮完成订单数: %s", len(completed))
             
         except Exception as e:
             self.logger.error(f"更新活跃订单状态失败: {e}")
     
+    def _apply_order_data(self, order_data: dict) -> Optional[OrderInfo]:
+        """
+        用交易所返回的订单数据更新本地订单状态，轮询和推送共用
+        
+        Args:
+            order_data: 订单数据，包含 id、status、cumMatchSize
+            
+        Returns:
+            Optional[OrderInfo]: 订单已成交或已取消时返回该订单，否则返回 None
+        """
+        order_info = self.active_orders.get(order_data.get('id'))
+        if not order_info:
+            return None
+        
+        order_info.status = order_data.get('status', 'UNKNOWN')
+        order_info.filled_size = Decimal(order_data.get('cumMatchSize') or '0')
+        
+        if order_info.status in ['FILLED', 'CANCELED']:
+            return order_info
+        return None
+    
+    def _on_order_update(self, order_data: dict):
+        """处理单条订单推送"""
+        order_info = self._apply_order_data(order_data)
+        if order_info:
+            self._complete_orders([order_info])
+    
+    def _complete_orders(self, completed: List[OrderInfo]):
+        """
+        处理已完成的订单并从活跃订单中移除
+        
+        Args:
+            completed: 已成交或已取消的订单
+        """
+        for order_info in completed:
+            self._handle_order_completion(order_info)
+        
+        # 从活跃订单中移除
+        active_orders = self.active_orders
+        for order_info in completed:
+            active_orders.pop(order_info.order_id, None)
+    
+    async def _start_order_stream(self):
+        """
+        订阅私有 WebSocket 的订单推送，由推送直接驱动订单完成处理
+        
+        SDK 的 WebSocket 客户端在后台线程中回调，通过 call_soon_threadsafe 切回事件循环；
+        连接失败或断开时退回 REST 轮询
+        """
+        if not self.config.use_websocket_orders:
+            return
+        
+        self._loop = asyncio.get_running_loop()
+        try:
+            self._ws_manager = WebSocketManager(
+                base_url=self.config.edgex_ws_url,
+                account_id=int(self.config.edgex_account_id),
+                stark_pri_key=self.config.edgex_stark_private_key
+            )
+            ws_client = self._ws_manager.get_private_client()
+            ws_client.on_message("trade-event", self._on_trade_event)
+            ws_client.on_disconnect(self._on_order_stream_disconnect)
+            
+            # connect 内部是阻塞的握手，放到线程池中执行
+            await self._loop.run_in_executor(None, self._ws_manager.connect_private)
+            self._order_stream_connected = True
+            self.logger.info("订单推送已连接，通过 WebSocket 跟踪订单状态")
+            
+        except Exception as e:
+            self._order_stream_connected = False
+            self.logger.warning(f"订单推送连接失败，改为轮询订单状态: {e}")
+    
+    def stop_order_stream(self):
+        """断开订单推送"""
+        self._order_stream_connected = False
+        if self._ws_manager:
+            try:
+                self._ws_manager.disconnect_all()
+            except Exception as e:
+                self.logger.warning(f"断开订单推送失败: {e}")
+            self._ws_manager = None
+    
+    def _on_trade_event(self, message: str):
+        """处理 trade-event 推送（在 WebSocket 线程中调用）"""
+        try:
+            content = json.loads(message).get('content', {})
+            if content.get('event') != 'ORDER_UPDATE':
+                return
+            
+            for order_data in content.get('data', {}).get('order', []):
+                self._loop.call_soon_threadsafe(self._on_order_update, order_data)
+                
+        except Exception as e:
+            self.logger.debug("处理订单推送失败: %s", e)
+    
+    def _on_order_stream_disconnect(self, error: Exception):
+        """订单推送断开（在 WebSocket 线程中调用），退回轮询"""
+        self._order_stream_connected = False
+        self.logger.warning(f"订单推送已断开，改为轮询订单状态: {error}")
+    
+    async def _query_orders(self, order_ids: List[str]) -> List[dict]:
+        """
+        批量查询订单
+        
+        每个请求最多查询 ORDER_QUERY_BATCH_SIZE 个订单，多个请求并发执行，
+        并发数由信号量限制以避免触发频率限制
+        
+        Args:
+            order_ids: 订单ID列表
+            
+        Returns:
+            List[dict]: 查询到的订单数据
+        """
+        async def query_batch(batch: List[str]) -> List[dict]:
+            async with self._query_semaphore:
+                order_result = await self._call_api(self.client.order.get_order_by_id, batch)
+            if order_result and 'data' in order_result:
+                return order_result['data'] or []
+            return []
+        
+        batches = [order_ids[i:i + ORDER_QUERY_BATCH_SIZE]
+                   for i in range(0, len(order_ids), ORDER_QUERY_BATCH_SIZE)]
+        results = await asyncio.gather(*(query_batch(batch) for batch in batches),
+                                       return_exceptions=True)
+        
+        order_list = []
+        for batch, result in zip(batches, results):
+            if isinstance(result, Exception):
+                self.logger.debug("查询订单状态失败 - 订单ID: %s, 错误: %s", batch, result)
+            else:
+                order_list.extend(result)
+        return order_list
+    
     def _handle_order_completion(self, order_info: OrderInfo):
-        """处理订单完成"""
+        """处理订单完成，更新网格级别状态（从活跃订单中移除由 _complete_orders 负责）"""
         try:
             if order_info.status == 'FILLED':
                 self.logger.log_trade(
@@ -385,20 +755,28 @@ class GridTradingStrategy:
                     order_id=order_info.order_id
                 )
                 
+                # 按成交数量调整持仓估计，下次持仓查询前的下单也能遵守持仓上限
+                filled_size = order_info.filled_size or order_info.size
+                if order_info.side == 'sell':
+                    filled_size = -filled_size
+                self._refresh_position_limit(self._position_estimate + filled_size)
+                
                 # 更新网格级别状态
-                for grid_level in self.grid_levels:
-                    if grid_level.buy_order_id == order_info.order_id:
-                        grid_level.is_buy_filled = True
-                        grid_level.buy_order_id = None
-                        break
-                    elif grid_level.sell_order_id == order_info.order_id:
+                grid_level = self._buy_order_to_level.pop(order_info.order_id, None)
+                if grid_level:
+                    grid_level.is_buy_filled = True
+                    grid_level.buy_order_id = None
+                else:
+                    grid_level = self._sell_order_to_level.pop(order_info.order_id, None)
+                    if grid_level:
                         grid_level.is_sell_filled = True
                         grid_level.sell_order_id = None
-                        break
-            
-            # 从活跃订单中移除
-            if order_info.order_id in self.active_orders:
-                del self.active_orders[order_info.order_id]
+                
+                if self.on_order_filled:
+                    self.on_order_filled(order_info)
+            else:
+                self._buy_order_to_level.pop(order_info.order_id, None)
+                self._sell_order_to_level.pop(order_info.order_id, None)
             
         except Exception as e:
             self.logger.error(f"处理订单完成失败: {e}")
@@ -420,59 +798,60 @@ class GridTradingStrategy:
                 await self._close_all_positions()
                 return
             
-            # 更新订单状态
-            await self._update_active_orders()
+            # 更新订单状态：订单推送连接正常时由推送驱动，只按 ORDER_RECONCILE_INTERVAL 低频轮询核对
+            now = time.time()
+            if (not self._order_stream_connected or
+                    now - self._last_order_reconcile >= ORDER_RECONCILE_INTERVAL):
+                self._last_order_reconcile = now
+                await self._update_active_orders()
             
             # 检查是否需要重新放置订单
             await self._rebalance_grid()
             
-            # 记录状态
-            unrealized_pnl = await self._calculate_unrealized_pnl()
-            self.logger.log_grid_status(
-                active_orders=len(self.active_orders),
-                position_size=str(self.position_size),
-                unrealized_pnl=str(unrealized_pnl) if unrealized_pnl else None
-            )
+            # 按 status_log_interval 限频记录状态
+            if now - self._last_status_log >= self.config.status_log_interval:
+                self._last_status_log = now
+                await self._log_status()
             
         except Exception as e:
             self.logger.error(f"检查和重新平衡失败: {e}")
     
+    async def _log_status(self):
+        """计算未实现盈亏并记录网格状态"""
+        unrealized_pnl = await self._calculate_unrealized_pnl()
+        self.logger.log_grid_status(
+            active_orders=len(self.active_orders),
+            position_size=str(self.position_size),
+            unrealized_pnl=str(unrealized_pnl) if unrealized_pnl else None
+        )
+    
     async def _rebalance_grid(self):
         """重新平衡网格"""
         try:
-            missing_orders_count = 0
+            buy_side, sell_side = self._split_grid()
+            buy_levels = []
+            sell_levels = []
             
-            for grid_level in self.grid_levels:
-                # 跳过中心价格附近的级别，避免立即成交
-                if abs(grid_level.price - self.center_price) < self.tick_size * 2:
-                    continue
-                
-                # 检查买单：价格在中心价格下方且没有活跃买单
-                if (grid_level.price < self.center_price and 
-                    not grid_level.buy_order_id):
-                    
+            # 检查买单：价格在中心价格下方且没有活跃买单
+            for grid_level in buy_side:
+                if not grid_level.buy_order_id:
                     # 如果之前已成交，重置标志
-                    if grid_level.is_buy_filled:
-                        grid_level.is_buy_filled = False
-                    
-                    await self._place_buy_order(grid_level)
-                    missing_orders_count += 1
-                    self.logger.debug(f"重新放置买单 - 价格: {grid_level.price}")
-                
-                # 检查卖单：价格在中心价格上方且没有活跃卖单
-                if (grid_level.price > self.center_price and 
-                    not grid_level.sell_order_id):
-                    
+                    grid_level.is_buy_filled = False
+                    buy_levels.append(grid_level)
+                    self.logger.debug("重新放置买单 - 价格: %s", grid_level.price)
+            
+            # 检查卖单：价格在中心价格上方且没有活跃卖单
+            for grid_level in sell_side:
+                if not grid_level.sell_order_id:
                     # 如果之前已成交，重置标志
-                    if grid_level.is_sell_filled:
-                        grid_level.is_sell_filled = False
-                    
-                    await self._place_sell_order(grid_level)
-                    missing_orders_count += 1
-                    self.logger.debug(f"重新放置卖单 - 价格: {grid_level.price}")
-                
-                await asyncio.sleep(0.05)  # 避免频率限制
+                    grid_level.is_sell_filled = False
+                    sell_levels.append(grid_level)
+                    self.logger.debug("重新放置卖单 - 价格: %s", grid_level.price)
             
+            # 并发补充缺失的订单
+            await self._place_orders(buy_levels, sell_levels)
+            
+            missing_orders_count = len(buy_levels) + len(sell_levels)
             if missing_orders_count > 0:
                 self.logger.info(f"重新平衡完成 - 补充了 {missing_orders_count} 个缺失的网格订单")
             
@@ -484,19 +863,19 @@ class GridTradingStrategy:
         try:
             self.logger.info("正在取消所有活跃订单...")
             
-            for order_id in list(self.active_orders.keys()):
+            if self.active_orders:
                 try:
-                    cancel_params = CancelOrderParams(order_id=order_id)
-                    cancel_result = await self.client.cancel_order(cancel_params)
-                    if cancel_result:
-                        self.logger.debug(f"订单取消成功 - 订单ID: {order_id}")
+                    # 按合约一次性撤销全部挂单
+                    await self._call_api(self.client.cancel_order,
+                                         CancelOrderParams(contract_id=self.contract_id))
                 except Exception as e:
-                    self.logger.warning(f"取消订单失败 - 订单ID: {order_id}, 错误: {e}")
-                
-                await asyncio.sleep(0.1)
+                    self.logger.warning(f"按合约撤单失败，改为逐个撤单: {e}")
+                    await self._cancel_orders(list(self.active_orders.keys()))
             
             # 清空活跃订单和网格状态
             self.active_orders.clear()
+            self._buy_order_to_level.clear()
+            self._sell_order_to_level.clear()
             for grid_level in self.grid_levels:
                 grid_level.buy_order_id = None
                 grid_level.sell_order_id = None
@@ -508,6 +887,28 @@ class GridTradingStrategy:
         except Exception as e:
             self.logger.error(f"取消所有订单失败: {e}")
     
+    async def _cancel_orders(self, order_ids: List[str]):
+        """
+        并发逐个撤单，并发数由信号量限制
+        
+        Args:
+            order_ids: 订单ID列表
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_CANCELS)
+        
+        async def cancel(order_id: str):
+            async with semaphore:
+                return await self._call_api(self.client.cancel_order,
+                                            CancelOrderParams(order_id=order_id))
+        
+        results = await asyncio.gather(*(cancel(order_id) for order_id in order_ids),
+                                       return_exceptions=True)
+        for order_id, result in zip(order_ids, results):
+            if isinstance(result, Exception):
+                self.logger.warning(f"取消订单失败 - 订单ID: {order_id}, 错误: {result}")
+            elif result:
+                self.logger.debug("订单取消成功 - 订单ID: %s", order_id)
+    
     async def _check_stop_loss(self) -> bool:
         """检查止损条件"""
         try:
@@ -517,11 +918,20 @@ class GridTradingStrategy:
             if not self.entry_price or not self.current_mid_price:
                 return False  # 价格信息不完整
             
-            # 计算当前价格相对于开仓价格的变动百分比
-            price_change_percent = abs((self.current_mid_price - self.entry_price) / self.entry_price * 100)
+            # 计算当前价格相对于开仓价格的变动百分比，先用浮点数快速判断
+            entry_price = float(self.entry_price)
+            price_change_percent = abs(float(self.current_mid_price) - entry_price) / entry_price * 100.0
+            threshold = float(self.config.stop_loss_percent)
+            
+            if abs(price_change_percent - threshold) > STOP_LOSS_EXACT_BAND:
+                should_stop = price_change_percent >= threshold
+            else:
+                # 接近阈值时用 Decimal 精确计算，避免浮点误差影响边界判断
+                price_change_percent = abs((self.current_mid_price - self.entry_price) / self.entry_price * 100)
+                should_stop = price_change_percent >= self.config.stop_loss_percent
             
             # 检查是否达到止损条件
-            if price_change_percent >= self.config.stop_loss_percent:
+            if should_stop:
                 self.logger.warning(f"触发止损 - 开仓价格: {self.entry_price}, "
                                   f"当前价格: {self.current_mid_price}, "
                                   f"变动: {price_change_percent:.2f}%, "
@@ -548,36 +958,31 @@ class GridTradingStrategy:
             self.logger.error(f"计算未实现盈亏失败: {e}")
             return None
     
-    async def _update_entry_price(self):
-        """更新平均开仓价格"""
+    async def _update_entry_price(self, position: Optional[dict]):
+        """
+        更新平均开仓价格
+        
+        Args:
+            position: 当前合约的持仓数据（来自 _find_position）
+        """
         try:
             if self.position_size == 0:
                 self.entry_price = None
                 self.initial_position_value = Decimal('0')
                 return
             
-            # 获取持仓信息来计算平均开仓价格
-            positions_data = await self.client.get_account_positions()
-            if not positions_data or 'data' not in positions_data:
-                return
-            
-            positions = positions_data.get('data', {}).get('positionList', [])
-            
-            for position in positions:
-                if position.get('contractId') == self.contract_id:
-                    # 尝试从持仓信息中获取平均价格
-                    avg_price = position.get('avgPrice')
-                    if avg_price:
-                        self.entry_price = Decimal(avg_price)
-                        self.initial_position_value = abs(self.position_size) * self.entry_price
-                        self.logger.debug(f"更新平均开仓价格: {self.entry_price}")
-                    break
+            # 尝试从持仓信息中获取平均价格
+            avg_price = position.get('avgPrice') if position else None
+            if avg_price:
+                self.entry_price = Decimal(avg_price)
+                self.initial_position_value = abs(self.position_size) * self.entry_price
+                self.logger.debug("更新平均开仓价格: %s", self.entry_price)
             
             # 如果无法从API获取，使用当前中间价作为估算
             if not self.entry_price and self.current_mid_price:
                 self.entry_price = self.current_mid_price
                 self.initial_position_value = abs(self.position_size) * self.entry_price
-                self.logger.debug(f"使用当前价格作为开仓价格: {self.entry_price}")
+                self.logger.debug("使用当前价格作为开仓价格: %s", self.entry_price)
                 
         except Exception as e:
             self.logger.error(f"更新平均开仓价格失败: {e}")
@@ -6,6 +6,7 @@
 
 import os
 import logging
+import logging.handlers
 import sys
 from datetime import datetime
 from typing import Optional
@@ -47,76 +48,90 @@ class GridTradingLogger:
         
         # 文件处理器
         if log_to_file:
-            if not os.path.exists(log_dir):
-                os.makedirs(log_dir)
+            os.makedirs(log_dir, exist_ok=True)
             
             today = datetime.now().strftime("%Y%m%d")
             log_file = os.path.join(log_dir, f"grid_trading_bot_{today}.log")
             
-            file_handler = logging.FileHandler(log_file, encoding='utf-8')
+            # 按大小轮转，首次写入时才打开文件
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=10 * 1024 * 1024, backupCount=5,
+                encoding='utf-8', delay=True
+            )
             file_handler.setFormatter(formatter)
             self.logger.addHandler(file_handler)
     
-    def info(self, message: str, extra_data: Optional[dict] = None):
-        """记录信息级别日志"""
+    def info(self, message: str, *args, extra_data: Optional[dict] = None,
+             exc_info: bool = False):
+        """记录信息级别日志，args 按 logging 的 % 格式延迟格式化"""
         if extra_data:
             message = f"{message} - {extra_data}"
-        self.logger.info(message)
+        self.logger.info(message, *args, exc_info=exc_info)
     
-    def warning(self, message: str, extra_data: Optional[dict] = None):
-        """记录警告级别日志"""
+    def warning(self, message: str, *args, extra_data: Optional[dict] = None,
+                exc_info: bool = False):
+        """记录警告级别日志，args 按 logging 的 % 格式延迟格式化"""
         if extra_data:
             message = f"{message} - {extra_data}"
-        self.logger.warning(message)
+        self.logger.warning(message, *args, exc_info=exc_info)
     
-    def error(self, message: str, extra_data: Optional[dict] = None):
-        """记录错误级别日志"""
+    def error(self, message: str, *args, extra_data: Optional[dict] = None,
+              exc_info: bool = False):
+        """记录错误级别日志，args 按 logging 的 % 格式延迟格式化"""
         if extra_data:
             message = f"{message} - {extra_data}"
-        self.logger.error(message)
+        self.logger.error(message, *args, exc_info=exc_info)
     
-    def debug(self, message: str, extra_data: Optional[dict] = None):
-        """记录调试级别日志"""
+    def debug(self, message: str, *args, extra_data: Optional[dict] = None,
+              exc_info: bool = False):
+        """记录调试级别日志，args 按 logging 的 % 格式延迟格式化"""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         if extra_data:
             message = f"{message} - {extra_data}"
-        self.logger.debug(message)
+        self.logger.debug(message, *args, exc_info=exc_info)
     
-    def critical(self, message: str, extra_data: Optional[dict] = None):
-        """记录严重错误级别日志"""
+    def critical(self, message: str, *args, extra_data: Optional[dict] = None,
+                 exc_info: bool = False):
+        """记录严重错误级别日志，args 按 logging 的 % 格式延迟格式化"""
         if extra_data:
             message = f"{message} - {extra_data}"
-        self.logger.critical(message)
+        self.logger.critical(message, *args, exc_info=exc_info)
     
     def log_trade(self, action: str, side: str, size: str, price: str, 
                   order_id: Optional[str] = None):
         """记录交易日志"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         trade_info = {
             'action': action,
             'side': side,
             'size': size,
             'price': price,
-            'order_id': order_id,
-            'timestamp': datetime.now().isoformat()
+            'order_id': order_id
         }
-        self.info(f"交易操作: {action}", trade_info)
+        self.info("交易操作: %s - %s", action, trade_info)
     
     def log_grid_status(self, active_orders: int, position_size: str, 
                        unrealized_pnl: Optional[str] = None):
         """记录网格状态日志"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         status_info = {
             'active_orders': active_orders,
             'position_size': position_size,
-            'unrealized_pnl': unrealized_pnl,
-            'timestamp': datetime.now().isoformat()
+            'unrealized_pnl': unrealized_pnl
         }
-        self.info("网格状态更新", status_info)
+        self.info("网格状态更新", extra_data=status_info)
     
     def log_error_with_retry(self, error: Exception, retry_count: int, max_retries: int):
         """记录错误和重试信息"""
+        if not self.logger.isEnabledFor(logging.WARNING):
+            return
         error_info = {
             'error_type': type(error).__name__,
             'error_message': str(error),
             'retry_count': retry_count,
             'max_retries': max_retries
         }
-        self.warning(f"操作失败，正在重试 ({retry_count}/{max_retries})", error_info)
+        self.warning("操作失败，正在重试 (%s/%s) - %s", retry_count, max_retries, error_info)
@@ -5,23 +5,26 @@
 提供命令行接口来启动机器人或查询余额
 """
 
-import asyncio
 import argparse
 import sys
 import os
-import json
+from decimal import Decimal
 from pathlib import Path
 
 # 添加项目根目录到Python路径
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
-from grid_trading_bot.bot import GridTradingBot, get_balance
-from grid_trading_bot.config import GridTradingConfig
+# 机器人模块依赖 EdgeX SDK，导入较慢，只在需要的命令中导入
+from grid_trading_bot.config import GridTradingConfig, load_json_file, save_json_file, validate_config_data
 
 
 def print_banner():
-    """打印启动横幅"""
+    """打印启动横幅，输出被重定向（如 cron、supervisor）时跳过"""
+    if not sys.stdout.isatty():
+        return
+    
     banner = """
 ╔══════════════════════════════════════════════════════════════╗
 ║                    EdgeX 网格交易机器人                        ║
@@ -35,6 +38,8 @@ def print_banner():
 
 async def run_bot(config_file: str = None):
     """运行网格交易机器人"""
+    from grid_trading_bot.bot import GridTradingBot
+    
     try:
         print("🚀 正在启动网格交易机器人...")
         
@@ -50,36 +55,45 @@ async def run_bot(config_file: str = None):
 
 async def query_balance(config_file: str = None):
     """查询账户余额"""
+    from grid_trading_bot.bot import get_balance, close_shared_clients
+    
     try:
         print("💰 正在查询账户余额...")
         
         balance_info = await get_balance(config_file)
         
-        print("\n" + "="*60)
-        print("📊 账户余额信息")
-        print("="*60)
-        print(f"总余额:       {float(balance_info['total_balance']):.4f} USDC")
-        print(f"可用余额:     {float(balance_info['available_balance']):.4f} USDC")
-        print(f"冻结余额:     {float(balance_info['frozen_balance']):.4f} USDC")
-        print(f"未实现盈亏:   {float(balance_info['unrealized_pnl']):.4f} USDC")
+        # 先拼接全部输出再一次性写出，避免逐行加锁刷新
+        lines = [
+            "\n" + "="*60,
+            "📊 账户余额信息",
+            "="*60,
+            # 余额字段是接口返回的十进制字符串，直接按 Decimal 格式化，避免转换为浮点数的精度损失
+            f"总余额:       {Decimal(balance_info['total_balance']):.4f} USDC",
+            f"可用余额:     {Decimal(balance_info['available_balance']):.4f} USDC",
+            f"冻结余额:     {Decimal(balance_info['frozen_balance']):.4f} USDC",
+            f"未实现盈亏:   {Decimal(balance_info['unrealized_pnl']):.4f} USDC",
+        ]
         
         if balance_info['positions']:
-            print("\n📈 持仓信息:")
-            print("-" * 60)
+            lines.append("\n📈 持仓信息:")
+            lines.append("-" * 60)
             for position in balance_info['positions']:
-                print(f"合约: {position['contract_name']}")
-                print(f"  持仓大小: {float(position['open_size']):.6f}")
-                print(f"  未实现盈亏: {float(position['unrealized_pnl']):.4f} USDC")
-                print(f"  保证金: {float(position['margin']):.4f} USDC")
-                print()
+                lines.append(f"合约: {position['contract_name']}")
+                lines.append(f"  持仓大小: {Decimal(position['open_size']):.6f}")
+                lines.append(f"  未实现盈亏: {Decimal(position['unrealized_pnl']):.4f} USDC")
+                lines.append(f"  保证金: {Decimal(position['margin']):.4f} USDC")
+                lines.append("")
         else:
-            print("\n📝 当前无持仓")
+            lines.append("\n📝 当前无持仓")
         
-        print("="*60)
+        lines.append("="*60)
+        print("\n".join(lines))
         
     except Exception as e:
         print(f"❌ 查询余额失败: {e}")
         sys.exit(1)
+    finally:
+        await close_shared_clients()
 
 
 def create_config_template(output_file: str):
@@ -88,8 +102,7 @@ def create_config_template(output_file: str):
         # 读取示例配置
         example_config_path = Path(__file__).parent / "config_example.json"
         if example_config_path.exists():
-            with open(example_config_path, 'r', encoding='utf-8') as f:
-                config_data = json.load(f)
+            config_data = load_json_file(example_config_path)
         else:
             # 如果示例文件不存在，创建默认配置
             config_data = {
@@ -112,8 +125,7 @@ def create_config_template(output_file: str):
             }
         
         # 保存配置文件
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(config_data, f, indent=2, ensure_ascii=False)
+        save_json_file(output_file, config_data)
         
         print(f"✅ 配置文件模板已创建: {output_file}")
         print("📝 请编辑配置文件，设置您的API密钥和交易参数")
@@ -126,7 +138,16 @@ def create_config_template(output_file: str):
 def validate_config(config_file: str):
     """验证配置文件"""
     try:
-        config = GridTradingConfig(config_file)
+        try:
+            config_data = load_json_file(config_file)
+        except FileNotFoundError:
+            # 与 GridTradingConfig 一致，配置文件不存在时改用环境变量
+            print(f"⚠️  配置文件不存在: {config_file}，跳过格式校验，验证环境变量配置")
+            config = GridTradingConfig()
+        else:
+            # 先按 JSON Schema 检查字段类型和取值范围，再由同一份数据构造配置对象做完整校验
+            validate_config_data(config_data)
+            config = GridTradingConfig.from_dict(config_data)
         config.validate()
         
         print(f"✅ 配置文件验证通过: {config_file}")
@@ -196,11 +217,19 @@ def main():
     
     # 执行对应的命令
     if args.command == 'run':
+        from grid_trading_bot.bot import run_event_loop, close_event_loop
         print_banner()
-        asyncio.run(run_bot(args.config))
+        try:
+            run_event_loop(run_bot(args.config))
+        finally:
+            close_event_loop()
     
     elif args.command == 'balance':
-        asyncio.run(query_balance(args.config))
+        from grid_trading_bot.bot import run_event_loop, close_event_loop
+        try:
+            run_event_loop(query_balance(args.config))
+        finally:
+            close_event_loop()
     
     elif args.command == 'create-config':
         create_config_template(args.output)
@@ -0,0 +1,101 @@
+"""
+网格交易机器人限流模块
+
+提供基于令牌桶的异步限流器，用于控制对交易所API的请求频率
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """
+    判断异常是否由交易所限流（HTTP 429）引起
+
+    SDK 对非 200 响应抛出 ValueError，状态码只出现在异常信息中
+
+    Args:
+        error: 请求抛出的异常
+
+    Returns:
+        bool: 是否为限流错误
+    """
+    return 'status code: 429' in str(error)
+
+
+class RateLimiter:
+    """异步令牌桶限流器"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """
+        初始化限流器
+
+        Args:
+            rate: 每秒允许的请求数，小于等于 0 表示不限流
+            burst: 允许的突发请求数，默认与 rate 相同
+        """
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.burst
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """获取一个请求令牌，令牌不足或处于限流退避期时等待"""
+        if self.rate <= 0:
+            return
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+
+                # 按经过的时间补充令牌
+                self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def set_rate(self, rate: float, burst: Optional[float] = None):
+        """
+        调整限流速率，保留当前令牌数和限流退避状态
+        
+        Args:
+            rate: 每秒允许的请求数，小于等于 0 表示不限流
+            burst: 允许的突发请求数，默认与 rate 相同
+        """
+        # 先按原速率结算到当前时刻的令牌，再切换速率
+        now = time.monotonic()
+        if self.rate > 0 and now > self._updated_at:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+        
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._tokens = min(self._tokens, self.burst)
+    
+    def penalize(self, delay: float):
+        """
+        收到限流响应后暂停所有请求并清空令牌
+
+        Args:
+            delay: 暂停时长（秒）
+        """
+        self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+        self._tokens = 0.0
+        self._updated_at = self._blocked_until
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
@@ -6,82 +6,118 @@
 """
 
 import asyncio
+import os
 import sys
-from pathlib import Path
+from typing import Optional
 
 # 添加项目路径
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
-from grid_trading_bot.bot import GridTradingBot
+from grid_trading_bot.bot import GridTradingBot, run_event_loop, close_event_loop
 
 
-async def test_bot_initialization():
+# 所有测试共用的机器人实例
+_BOT: Optional[GridTradingBot] = None
+
+
+async def make_bot() -> GridTradingBot:
+    """获取共享的已初始化机器人，多个测试只做一次初始化"""
+    global _BOT
+    if _BOT is None:
+        bot = GridTradingBot("config.json")
+        await bot.initialize()
+        _BOT = bot
+    return _BOT
+
+
+async def test_bot_initialization(bot: GridTradingBot):
     """测试机器人初始化"""
-    print("🧪 测试机器人初始化...")
+    # 输出先写入缓冲区，测试结束时一次性打印
+    lines = []
+    out = lines.append
+    
+    out("🧪 测试机器人初始化...")
     
     try:
-        bot = GridTradingBot("config.json")
-        await bot.initialize()
-        
-        print("✅ 机器人初始化成功")
+        out("✅ 机器人初始化成功")
         
         # 获取状态
         status = bot.get_status()
-        print(f"📊 机器人状态: {status}")
+        out(f"📊 机器人状态: {status}")
         
         # 获取余额
         balance = await bot.get_account_balance()
-        print(f"💰 账户余额: {balance}")
+        out(f"💰 账户余额: {balance}")
         
-        # 清理
-        await bot.stop()
-        
-        print("✅ 测试完成")
+        out("✅ 测试完成")
         
     except Exception as e:
-        print(f"❌ 测试失败: {e}")
+        out(f"❌ 测试失败: {e}")
         import traceback
-        traceback.print_exc()
+        out(traceback.format_exc().rstrip())
+    finally:
+        print("\n".join(lines))
 
 
-async def test_strategy_initialization():
+async def test_strategy_initialization(bot: GridTradingBot):
     """测试策略初始化"""
-    print("\n🧪 测试策略初始化...")
+    # 输出先写入缓冲区，测试结束时一次性打印
+    lines = []
+    out = lines.append
+    
+    out("\n🧪 测试策略初始化...")
     
     try:
-        bot = GridTradingBot("config.json")
-        await bot.initialize()
-        
         if bot.strategy:
             strategy_status = bot.strategy.get_strategy_status()
-            print(f"📈 策略状态: {strategy_status}")
+            out(f"📈 策略状态: {strategy_status}")
             
-            print(f"🎯 中心价格: {strategy_status.get('center_price', 'N/A')}")
-            print(f"📊 网格级别数: {strategy_status.get('grid_levels_count', 0)}")
-            print(f"💼 持仓大小: {strategy_status.get('position_size', '0')}")
+            out(f"🎯 中心价格: {strategy_status.get('center_price', 'N/A')}")
+            out(f"📊 网格级别数: {strategy_status.get('grid_levels_count', 0)}")
+            out(f"💼 持仓大小: {strategy_status.get('position_size', '0')}")
         
-        await bot.stop()
-        print("✅ 策略测试完成")
+        out("✅ 策略测试完成")
         
     except Exception as e:
-        print(f"❌ 策略测试失败: {e}")
+        out(f"❌ 策略测试失败: {e}")
         import traceback
-        traceback.print_exc()
+        out(traceback.format_exc().rstrip())
+    finally:
+        print("\n".join(lines))
 
 
 async def main():
     """主测试函数"""
-    print("🚀 EdgeX 网格交易机器人功能测试")
-    print("=" * 50)
+    print("\n".join([
+        "🚀 EdgeX 网格交易机器人功能测试",
+        "=" * 50,
+    ]))
     
-    await test_bot_initialization()
-    await test_strategy_initialization()
+    try:
+        bot = await make_bot()
+    except Exception as e:
+        print(f"❌ 机器人初始化失败: {e}")
+        import traceback
+        traceback.print_exc()
+        return
+    
+    try:
+        # 两个测试只读取共享机器人的状态，并发执行以重叠网络等待
+        await asyncio.gather(test_bot_initialization(bot), test_strategy_initialization(bot))
+    finally:
+        await bot.stop()
     
-    print("\n🎉 所有测试完成！")
-    print("现在您可以启动机器人:")
-    print("  python3 main.py run -c config.json")
+    print("\n".join([
+        "\n🎉 所有测试完成！",
+        "现在您可以启动机器人:",
+        "  python3 main.py run -c config.json",
+    ]))
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        run_event_loop(main())
+    finally:
+        close_event_loop()
@@ -6,25 +6,85 @@
 """
 
 import asyncio
+import copy
+import os
 import sys
-from pathlib import Path
+from decimal import Decimal
+from typing import Iterable, List, Optional, Tuple
 
 # 添加项目路径
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
-from grid_trading_bot.bot import GridTradingBot
+from grid_trading_bot.bot import GridTradingBot, run_event_loop, close_event_loop
 
 
-async def test_price_improvements():
-    """测试价格获取改进"""
-    print("🧪 测试价格获取改进...")
-    
-    try:
+# 所有测试共用的机器人实例
+_BOT: Optional[GridTradingBot] = None
+
+# 止损场景队列容量，生产者超前消费者过多时等待
+SCENARIO_QUEUE_SIZE = 32
+
+
+async def make_bot() -> GridTradingBot:
+    """获取共享的已初始化机器人，多个测试只做一次初始化"""
+    global _BOT
+    if _BOT is None:
         bot = GridTradingBot("config.json")
         await bot.initialize()
+        _BOT = bot
+    return _BOT
+
+
+async def check_stop_loss_cases(strategy, cases: Iterable[Tuple[Decimal, Optional[bool]]]
+                                ) -> List[Tuple[Decimal, bool, Optional[bool]]]:
+    """
+    依次检查一组价格场景的止损结果
+    
+    场景经有界队列交给单个消费者协程处理，设置价格与止损检查串行进行，
+    场景之间互不干扰，也不会为每个场景单独创建任务
+    
+    Args:
+        strategy: 用于模拟的策略对象
+        cases: (价格, 预期结果) 序列，预期结果为 None 表示不校验
         
-        print("✅ 机器人初始化成功")
+    Returns:
+        List[Tuple[Decimal, bool, Optional[bool]]]: (价格, 止损结果, 预期结果) 列表
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=SCENARIO_QUEUE_SIZE)
+    results = []
+    
+    async def consume():
+        while True:
+            case = await queue.get()
+            if case is None:
+                return
+            price, expected = case
+            strategy.current_mid_price = price
+            results.append((price, await strategy._check_stop_loss(), expected))
+    
+    consumer = asyncio.ensure_future(consume())
+    try:
+        for case in cases:
+            await queue.put(case)
+        await queue.put(None)
+        await consumer
+    finally:
+        consumer.cancel()
+    return results
+
+
+async def test_price_improvements(bot: GridTradingBot):
+    """测试价格获取改进"""
+    # 输出先写入缓冲区，测试结束时一次性打印
+    lines = []
+    out = lines.append
+    
+    out("🧪 测试价格获取改进...")
+    
+    try:
+        out("✅ 机器人初始化成功")
         
         # 获取策略状态
         if bot.strategy:
@@ -33,118 +93,145 @@ async def test_price_improvements():
             
             strategy_status = bot.strategy.get_strategy_status()
             
-            print("\n📊 价格信息:")
-            print(f"  买价 (Bid): {strategy_status.get('current_bid', 'N/A')}")
-            print(f"  卖价 (Ask): {strategy_status.get('current_ask', 'N/A')}")
-            print(f"  中间价: {strategy_status.get('current_mid_price', 'N/A')}")
-            print(f"  中心价格: {strategy_status.get('center_price', 'N/A')}")
+            out("\n📊 价格信息:")
+            out(f"  买价 (Bid): {strategy_status.get('current_bid', 'N/A')}")
+            out(f"  卖价 (Ask): {strategy_status.get('current_ask', 'N/A')}")
+            out(f"  中间价: {strategy_status.get('current_mid_price', 'N/A')}")
+            out(f"  中心价格: {strategy_status.get('center_price', 'N/A')}")
             
             # 测试未实现盈亏计算
             if bot.strategy.position_size != 0:
                 unrealized_pnl = await bot.strategy._calculate_unrealized_pnl()
-                print(f"\n💰 持仓信息:")
-                print(f"  持仓大小: {strategy_status.get('position_size', '0')}")
-                print(f"  开仓价格: {strategy_status.get('entry_price', 'N/A')}")
-                print(f"  未实现盈亏: {unrealized_pnl if unrealized_pnl is not None else 'N/A'}")
+                out(f"\n💰 持仓信息:")
+                out(f"  持仓大小: {strategy_status.get('position_size', '0')}")
+                out(f"  开仓价格: {strategy_status.get('entry_price', 'N/A')}")
+                out(f"  未实现盈亏: {unrealized_pnl if unrealized_pnl is not None else 'N/A'}")
                 
                 # 测试止损检查
                 should_stop = await bot.strategy._check_stop_loss()
-                print(f"  止损状态: {'触发' if should_stop else '正常'}")
+                out(f"  止损状态: {'触发' if should_stop else '正常'}")
             else:
-                print(f"\n💰 当前无持仓")
+                out(f"\n💰 当前无持仓")
         
-        # 清理
-        await bot.stop()
-        print("\n✅ 价格获取测试完成")
+        out("\n✅ 价格获取测试完成")
         
     except Exception as e:
-        print(f"❌ 测试失败: {e}")
+        out(f"❌ 测试失败: {e}")
         import traceback
-        traceback.print_exc()
+        out(traceback.format_exc().rstrip())
+    finally:
+        print("\n".join(lines))
 
 
-async def test_stop_loss_logic():
+async def test_stop_loss_logic(bot: GridTradingBot):
     """测试止损逻辑"""
-    print("\n🛡️ 测试止损逻辑...")
+    # 输出先写入缓冲区，测试结束时一次性打印
+    lines = []
+    out = lines.append
+    
+    out("\n🛡️ 测试止损逻辑...")
     
     try:
-        bot = GridTradingBot("config.json")
-        await bot.initialize()
-        
         if bot.strategy:
-            # 模拟设置一些测试数据
-            from decimal import Decimal
+            # 机器人由多个测试共用，在策略的浅拷贝上模拟，不影响真实状态
+            strategy = copy.copy(bot.strategy)
             
             # 模拟持仓和价格数据
-            bot.strategy.position_size = Decimal('0.1')  # 模拟持仓
-            bot.strategy.entry_price = Decimal('4000')   # 模拟开仓价格
-            bot.strategy.current_mid_price = Decimal('4500')  # 模拟当前价格
+            strategy.position_size = Decimal('0.1')  # 模拟持仓
+            strategy.entry_price = Decimal('4000')   # 模拟开仓价格
+            strategy.current_mid_price = Decimal('4500')  # 模拟当前价格
             
-            print("📋 模拟数据:")
-            print(f"  持仓大小: {bot.strategy.position_size}")
-            print(f"  开仓价格: {bot.strategy.entry_price}")
-            print(f"  当前价格: {bot.strategy.current_mid_price}")
-            print(f"  止损阈值: {bot.config.stop_loss_percent}%")
+            out("📋 模拟数据:")
+            out(f"  持仓大小: {strategy.position_size}")
+            out(f"  开仓价格: {strategy.entry_price}")
+            out(f"  当前价格: {strategy.current_mid_price}")
+            out(f"  止损阈值: {bot.config.stop_loss_percent}%")
             
             # 计算价格变动百分比
-            price_change = abs((bot.strategy.current_mid_price - bot.strategy.entry_price) / bot.strategy.entry_price * 100)
-            print(f"  价格变动: {price_change:.2f}%")
+            price_change = abs((strategy.current_mid_price - strategy.entry_price) / strategy.entry_price * 100)
+            out(f"  价格变动: {price_change:.2f}%")
             
             # 测试止损检查
-            should_stop = await bot.strategy._check_stop_loss()
-            print(f"  止损结果: {'触发' if should_stop else '正常'}")
+            should_stop = await strategy._check_stop_loss()
+            out(f"  止损结果: {'触发' if should_stop else '正常'}")
             
             # 测试未实现盈亏计算
-            unrealized_pnl = await bot.strategy._calculate_unrealized_pnl()
-            print(f"  未实现盈亏: {unrealized_pnl}")
+            unrealized_pnl = await strategy._calculate_unrealized_pnl()
+            out(f"  未实现盈亏: {unrealized_pnl}")
             
             # 测试不同的价格场景
-            print("\n🔄 测试不同价格场景:")
+            out("\n🔄 测试不同价格场景:")
             
-            # 场景1: 小幅波动
-            bot.strategy.current_mid_price = Decimal('4100')
-            price_change = abs((bot.strategy.current_mid_price - bot.strategy.entry_price) / bot.strategy.entry_price * 100)
-            should_stop = await bot.strategy._check_stop_loss()
-            print(f"  场景1 (4100): 变动{price_change:.2f}%, 止损{'触发' if should_stop else '正常'}")
+            scenarios = [
+                Decimal('4100'),  # 小幅波动
+                Decimal('3500'),  # 大幅波动（下跌12.5%，超过止损阈值）
+                Decimal('4500'),  # 上涨12.5%，超过止损阈值
+            ]
+            results = await check_stop_loss_cases(strategy, ((price, None) for price in scenarios))
+            for i, (price, should_stop, _) in enumerate(results, 1):
+                price_change = abs((price - strategy.entry_price) / strategy.entry_price * 100)
+                out(f"  场景{i} ({price}): 变动{price_change:.2f}%, 止损{'触发' if should_stop else '正常'}")
             
-            # 场景2: 大幅波动（超过止损阈值）
-            bot.strategy.current_mid_price = Decimal('3500')  # 下跌12.5%
-            price_change = abs((bot.strategy.current_mid_price - bot.strategy.entry_price) / bot.strategy.entry_price * 100)
-            should_stop = await bot.strategy._check_stop_loss()
-            print(f"  场景2 (3500): 变动{price_change:.2f}%, 止损{'触发' if should_stop else '正常'}")
+            # 批量扫描开仓价 ±20% 的整数价格：先用浮点数一次性算出预期结果，
+            # 再抽样调用策略的止损检查，验证两者一致
+            out("\n🔍 批量扫描价格场景:")
+            entry = int(strategy.entry_price)
+            threshold = float(bot.config.stop_loss_percent)
+            sweep_prices = range(entry * 8 // 10, entry * 12 // 10 + 1)
+            expected = [abs(price - entry) / entry * 100.0 >= threshold for price in sweep_prices]
+            out(f"  扫描价格数: {len(sweep_prices)}, 预期触发止损: {sum(expected)}")
             
-            # 场景3: 上涨超过止损阈值
-            bot.strategy.current_mid_price = Decimal('4500')  # 上涨12.5%
-            price_change = abs((bot.strategy.current_mid_price - bot.strategy.entry_price) / bot.strategy.entry_price * 100)
-            should_stop = await bot.strategy._check_stop_loss()
-            print(f"  场景3 (4500): 变动{price_change:.2f}%, 止损{'触发' if should_stop else '正常'}")
+            samples = range(0, len(sweep_prices), 100)
+            results = await check_stop_loss_cases(
+                strategy, ((Decimal(sweep_prices[i]), expected[i]) for i in samples))
+            mismatches = [int(price) for price, should_stop, want in results if should_stop != want]
+            out(f"  抽样校验: {len(samples)} 个, 不一致: {mismatches if mismatches else '无'}")
         
-        await bot.stop()
-        print("\n✅ 止损逻辑测试完成")
+        out("\n✅ 止损逻辑测试完成")
         
     except Exception as e:
-        print(f"❌ 止损测试失败: {e}")
+        out(f"❌ 止损测试失败: {e}")
         import traceback
-        traceback.print_exc()
+        out(traceback.format_exc().rstrip())
+    finally:
+        print("\n".join(lines))
 
 
 async def main():
     """主测试函数"""
-    print("🚀 EdgeX 网格交易机器人改进功能测试")
-    print("=" * 60)
+    print("\n".join([
+        "🚀 EdgeX 网格交易机器人改进功能测试",
+        "=" * 60,
+    ]))
     
-    await test_price_improvements()
-    await test_stop_loss_logic()
+    try:
+        bot = await make_bot()
+    except Exception as e:
+        print(f"❌ 机器人初始化失败: {e}")
+        import traceback
+        traceback.print_exc()
+        return
     
-    print("\n📋 测试总结:")
-    print("✅ 价格获取: 使用订单簿中间价，更准确实时")
-    print("✅ 止损机制: 监控持仓，自动平仓保护")
-    print("✅ 盈亏计算: 实时计算未实现盈亏")
-    print("\n🎯 改进点:")
-    print("- 中心价格使用买卖中间价，更准确反映市场")
-    print("- 止损机制监控所有持仓，达到阈值自动平仓")
-    print("- 增加了详细的价格和盈亏跟踪")
+    try:
+        # 止损测试在策略副本上模拟数据，可以与价格测试并发执行
+        await asyncio.gather(test_price_improvements(bot), test_stop_loss_logic(bot))
+    finally:
+        await bot.stop()
+    
+    print("\n".join([
+        "\n📋 测试总结:",
+        "✅ 价格获取: 使用订单簿中间价，更准确实时",
+        "✅ 止损机制: 监控持仓，自动平仓保护",
+        "✅ 盈亏计算: 实时计算未实现盈亏",
+        "\n🎯 改进点:",
+        "- 中心价格使用买卖中间价，更准确反映市场",
+        "- 止损机制监控所有持仓，达到阈值自动平仓",
+        "- 增加了详细的价格和盈亏跟踪",
+    ]))
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        run_event_loop(main())
+    finally:
+        close_event_loop()
@@ -4,15 +4,17 @@
 Test script for disable stop loss functionality
 """
 
-import asyncio
+import os
 import sys
-from pathlib import Path
 from decimal import Decimal
 
 # 添加项目根目录到路径
-sys.path.append(str(Path(__file__).parent))
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.append(project_root)
 
 from trading_bot import TradingBot, TradingConfig
+from grid_trading_bot.bot import run_event_loop, close_event_loop
 
 
 async def test_disable_stop_loss():
@@ -50,15 +52,22 @@ async def test_disable_stop_loss():
         disable_stop_loss=True  # 禁用止损
     )
     
-    print("📋 配置对比:")
-    print(f"  配置1 - 启用止损: disable_stop_loss = {config_with_stop_loss.disable_stop_loss}")
-    print(f"  配置2 - 禁用止损: disable_stop_loss = {config_without_stop_loss.disable_stop_loss}")
+    print("\n".join([
+        "📋 配置对比:",
+        f"  配置1 - 启用止损: disable_stop_loss = {config_with_stop_loss.disable_stop_loss}",
+        f"  配置2 - 禁用止损: disable_stop_loss = {config_without_stop_loss.disable_stop_loss}",
+    ]))
     
-    print("\n✅ 配置测试完成!")
-    print("\n💡 使用方法:")
-    print("  启用止损 (默认): python runbot.py --exchange edgex --ticker ETH --quantity 0.1 --take-profit 0.02 --stop-loss 0.1")
-    print("  禁用止损 (新功能): python runbot.py --exchange edgex --ticker ETH --quantity 0.1 --take-profit 0.02 --stop-loss 0.1 --disable-stop-loss")
+    print("\n".join([
+        "\n✅ 配置测试完成!",
+        "\n💡 使用方法:",
+        "  启用止损 (默认): python runbot.py --exchange edgex --ticker ETH --quantity 0.1 --take-profit 0.02 --stop-loss 0.1",
+        "  禁用止损 (新功能): python runbot.py --exchange edgex --ticker ETH --quantity 0.1 --take-profit 0.02 --stop-loss 0.1 --disable-stop-loss",
+    ]))
 
 
 if __name__ == "__main__":
-    asyncio.run(test_disable_stop_loss())
+    try:
+        run_event_loop(test_disable_stop_loss())
+    finally:
+        close_event_loop()
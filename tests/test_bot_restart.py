@@ -0,0 +1,92 @@
+"""
+网格交易机器人重启流程测试
+
+使用记录调用顺序的策略替身驱动 GridTradingBot.run()，不需要网络连接和配置文件
+"""
+
+import asyncio
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from grid_trading_bot.bot import GridTradingBot
+
+
+class RecordingStrategy:
+    """记录下单、检查和撤单调用的策略替身，首次下单时抛出异常以触发重启"""
+
+    def __init__(self, bot: GridTradingBot, calls: list, stop_on_check: bool = False):
+        self.bot = bot
+        self.calls = calls
+        self.stop_on_check = stop_on_check
+
+    async def place_grid_orders(self):
+        self.calls.append('place')
+        if self.calls.count('place') == 1:
+            raise RuntimeError("模拟启动失败")
+
+    async def check_and_rebalance(self):
+        self.calls.append('check')
+        if self.stop_on_check:
+            self.bot._stop_event.set()
+
+    async def cancel_all_orders(self):
+        self.calls.append('cancel')
+
+    def stop_order_stream(self):
+        pass
+
+
+def make_bot(monkeypatch, calls: list, stop_on_check: bool = False) -> GridTradingBot:
+    """创建使用环境变量配置、策略替身和空客户端的机器人"""
+    monkeypatch.setenv('EDGEX_ACCOUNT_ID', '1')
+    monkeypatch.setenv('EDGEX_STARK_PRIVATE_KEY', 'test-key')
+    monkeypatch.setenv('AUTO_RESTART', 'true')
+    monkeypatch.setenv('LOG_TO_FILE', 'false')
+
+    bot = GridTradingBot()
+    strategy = RecordingStrategy(bot, calls, stop_on_check)
+
+    async def initialize():
+        # 只创建事件和策略，不连接交易所、不注册信号处理器
+        calls.append('init')
+        if bot._stop_event is None:
+            bot._stop_event = asyncio.Event()
+        if bot._reload_event is None:
+            bot._reload_event = asyncio.Event()
+        bot.strategy = strategy
+
+    monkeypatch.setattr(bot, 'initialize', initialize)
+    return bot
+
+
+def test_stop_signal_during_restart_backoff_places_no_orders(monkeypatch):
+    calls = []
+    bot = make_bot(monkeypatch, calls)
+
+    async def run():
+        # 首次启动失败后进入重启退避（至少10秒），期间发送停止信号
+        asyncio.get_running_loop().call_later(0.1, lambda: bot._stop_event.set())
+        await asyncio.wait_for(bot.run(), timeout=5)
+
+    asyncio.run(run())
+
+    assert calls == ['init', 'place', 'cancel', 'cancel']
+
+
+def test_successful_restart_starts_once(monkeypatch):
+    calls = []
+    bot = make_bot(monkeypatch, calls, stop_on_check=True)
+
+    # 跳过重启退避：等待停止信号直接超时
+    async def no_backoff(awaitable, timeout):
+        awaitable.close()
+        raise asyncio.TimeoutError()
+
+    monkeypatch.setattr(asyncio, 'wait_for', no_backoff)
+    asyncio.run(bot.run())
+
+    assert calls == ['init', 'place', 'cancel', 'init', 'place', 'check', 'cancel']